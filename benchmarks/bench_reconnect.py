@@ -0,0 +1,74 @@
+"""Benchmark d'une tempête de reconnexions WebSocket.
+
+Lance le vrai `websocket_handler` sur un port libre avec une grande grille
+synthétique, connecte N overlays en même temps et mesure les connexions/s
+(handshake + réception du INIT), avec et sans le cache du message INIT.
+
+    python benchmarks/bench_reconnect.py --clients 300 --rounds 5
+    python benchmarks/bench_reconnect.py --compression none
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import websockets
+import main
+
+def synthetic_grid(size, nb_words):
+    words = []
+    for i in range(nb_words):
+        horizontal = i % 2 == 0
+        length = 4 + i % (size - 4)
+        words.append({
+            "id": i + 1, "clue": f"Définition numéro {i + 1} assez longue pour peser",
+            "answer": "MOT" * (length // 3) + "X" * (length % 3),
+            "x": (i * 7) % (size - length) if horizontal else i % size,
+            "y": i % size if horizontal else (i * 7) % (size - length),
+            "direction": "horizontal" if horizontal else "vertical", "solved": i % 3 == 0
+        })
+    return {"grid_id": "bench", "size": size, "words": words, "revealed": "0" * size * size}
+
+async def storm(port, clients, compression):
+    async def connect():
+        async with websockets.connect(f"ws://127.0.0.1:{port}", compression=compression, proxy=None) as ws:
+            await ws.recv()
+    start = time.perf_counter()
+    await asyncio.gather(*[connect() for _ in range(clients)])
+    return time.perf_counter() - start
+
+async def run(args):
+    compression = None if args.compression == 'none' else args.compression
+    main.current_grid = synthetic_grid(args.size, args.words)
+    main.grid_changed()
+    payload_size = len(main.init_payload())
+    server = await websockets.serve(main.websocket_handler, "127.0.0.1", 0,
+                                    compression=compression, backlog=main.WS_BACKLOG)
+    port = server.sockets[0].getsockname()[1]
+
+    cached_payload = main.init_payload
+    uncached_payload = lambda: json.dumps({"type": "INIT", "grid": main.current_grid})
+    print(f"INIT : {payload_size / 1024:.1f} Ko, {args.clients} clients, compression={args.compression}")
+    try:
+        for label, payload in [("sans cache", uncached_payload), ("avec cache", cached_payload)]:
+            main.init_payload = payload
+            await storm(port, min(args.clients, 20), compression)
+            durations = [await storm(port, args.clients, compression) for _ in range(args.rounds)]
+            best = min(durations)
+            print(f"{label:>11} : {args.clients / best:8.0f} connexions/s (meilleur de {args.rounds} : {best * 1000:.0f} ms)")
+    finally:
+        main.init_payload = cached_payload
+        server.close()
+        await server.wait_closed()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--size", type=int, default=30)
+    parser.add_argument("--words", type=int, default=120)
+    parser.add_argument("--compression", default="deflate", choices=["deflate", "none"])
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,110 @@
+"""Benchmark du redémarrage : démarrage du processus jusqu'à la première commande traitée.
+
+Prépare dans un dossier temporaire une grande grille, un journal de classement
+et des scores volumineux, puis lance à chaque tour un nouveau processus Python
+qui charge l'état (à froid depuis les fichiers, ou à chaud depuis la reprise)
+et exécute `!classement semaine` puis `!score`.
+
+    python benchmarks/bench_restart.py --rounds 5 --solves 50000
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+CHILD = """
+import asyncio, sys
+sys.path.insert(0, {root!r})
+import main
+
+class Author:
+    name = "joueur1"
+
+class Context:
+    author = Author()
+    async def send(self, content):
+        pass
+
+warm = main.load_state()
+asyncio.run(main.Bot.classement._callback(None, Context(), "semaine"))
+asyncio.run(main.Bot.score._callback(None, Context()))
+print("PRET", "chaud" if warm else "froid", flush=True)
+"""
+
+def synthetic_grid(size, nb_words):
+    words = []
+    for i in range(nb_words):
+        y = (2 * i) % size
+        x = (i // (size // 2)) * 6 % (size - 5)
+        words.append({"id": i + 1, "clue": f"Définition {i + 1}", "answer": "MOTS" + chr(65 + i % 26),
+                      "x": x, "y": y, "direction": "horizontal", "solved": i % 3 == 0})
+    return {"grid_id": "bench", "size": size, "words": words}
+
+def prepare(directory, args):
+    with open(os.path.join(directory, 'grille_exemple.json'), 'w', encoding='utf-8') as f:
+        json.dump(synthetic_grid(args.size, args.words), f)
+    with open(os.path.join(directory, 'scores.json'), 'w', encoding='utf-8') as f:
+        json.dump({f"joueur{i}": i for i in range(args.players)}, f)
+    solves = os.path.join(directory, 'solves')
+    os.makedirs(solves)
+    now = time.time()
+    # Un seul segment non compacté : le pire cas, entièrement rejoué au démarrage à froid
+    with open(os.path.join(solves, 'segment-000001.jsonl'), 'w', encoding='utf-8') as f:
+        for i in range(args.solves):
+            f.write(json.dumps({"user": f"joueur{i % args.players}", "grid": f"g{i // 50}", "word": i % 50,
+                                "ts": now - i, "pts": 10, "session": "bench"}, separators=(',', ':')) + "\n")
+
+def start_process(directory, env):
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", CHILD.format(root=str(ROOT))], cwd=directory, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    elapsed = time.perf_counter() - start
+    return elapsed, out.strip().splitlines()[-1]
+
+def main_bench(args):
+    env = {**os.environ, "TWITCH_CHANNEL": "bench", "SNAPSHOT_FILE": "reprise.json"}
+    with tempfile.TemporaryDirectory() as directory:
+        prepare(directory, args)
+        snapshot = os.path.join(directory, 'reprise.json')
+
+        cold = [start_process(directory, env) for _ in range(args.rounds)]
+
+        # Une reprise est produite par un processus qui charge tout puis s'arrête proprement
+        subprocess.run([sys.executable, "-c", f"import sys; sys.path.insert(0, {str(ROOT)!r}); import main; "
+                        "main.load_state(); main.init_payload(); main.save_snapshot()"],
+                       cwd=directory, env=env, capture_output=True, check=True)
+        shutil.copy(snapshot, snapshot + '.orig')
+        warm = []
+        for _ in range(args.rounds):
+            shutil.copy(snapshot + '.orig', snapshot)
+            warm.append(start_process(directory, env))
+
+        print(f"Grille {args.size}x{args.size} ({args.words} mots), {args.solves} résolutions, {args.players} joueurs, "
+              f"reprise {os.path.getsize(snapshot + '.orig') / 1024:.0f} Ko")
+        imports = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", f"import sys; sys.path.insert(0, {str(ROOT)!r}); import main"],
+                           cwd=directory, env=env, check=True)
+            imports.append((time.perf_counter() - start, "import main seul"))
+        for label, runs in [("import", imports), ("à froid", cold), ("à chaud", warm)]:
+            times = sorted(t for t, _ in runs)
+            print(f"{label:>8} : meilleur {times[0] * 1000:6.0f} ms, médian {times[len(times) // 2] * 1000:6.0f} ms "
+                  f"({runs[0][1]})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--size", type=int, default=40)
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--solves", type=int, default=50000)
+    parser.add_argument("--players", type=int, default=2000)
+    main_bench(parser.parse_args())
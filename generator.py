@@ -1,17 +1,128 @@
 import json
+import math
 import random
 import os
 import copy
+import uuid
+from word_stats import WordStats
+
+GENERATION_RETRIES = 5
+DIFFICULTY_SPREAD = 0.15
+NEUTRAL_DIFFICULTY = 0.5
+_sampler_cache = {"key": None, "stats": None, "sampler": None, "index": None}
+
+class FenwickSampler:
+    """Tirage pondéré sur un arbre de Fenwick : construction en O(n), tirage et changement d'un poids en O(log n)"""
+
+    def __init__(self, items, weights):
+        self.items = list(items)
+        self.weights = list(weights)
+        n = len(self.items)
+        self.tree = [0.0] + self.weights
+        for j in range(1, n + 1):
+            parent = j + (j & -j)
+            if parent <= n:
+                self.tree[parent] += self.tree[j]
+        self.total = sum(self.weights)
+
+    def __len__(self):
+        return len(self.items)
+
+    def update(self, i, weight):
+        delta = weight - self.weights[i]
+        self.weights[i] = weight
+        self.total += delta
+        j = i + 1
+        while j < len(self.tree):
+            self.tree[j] += delta
+            j += j & -j
+
+    def sample(self):
+        n = len(self.items)
+        r = random.random() * self.total
+        pos, step = 0, 1 << (n.bit_length() - 1)
+        while step:
+            if pos + step <= n and self.tree[pos + step] <= r:
+                pos += step
+                r -= self.tree[pos]
+            step >>= 1
+        return self.items[min(pos, n - 1)]
+
+def file_key(filename):
+    try:
+        stat = os.stat(filename)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+def word_cells(word, size):
+    """Indices à plat (y * size + x) des cases occupées par un mot"""
+    if word['direction'] == 'horizontal':
+        return [word['y'] * size + word['x'] + i for i in range(len(word['answer']))]
+    return [(word['y'] + i) * size + word['x'] for i in range(len(word['answer']))]
+
+def build_cell_table(words, size):
+    """Table des cases occupées triée par indice : mots propriétaires (w) et numéros de départ (n).
+
+    Renseigne aussi `cells` sur chaque mot, pour savoir sans géométrie quelles cases il révèle.
+    Les lettres (l) ne sont ajoutées qu'une fois la case découverte.
+    """
+    cells = {}
+    for word in words:
+        word['cells'] = word_cells(word, size)
+        for k, i in enumerate(word['cells']):
+            cell = cells.setdefault(i, {"i": i, "w": []})
+            cell["w"].append(word['id'])
+            if k == 0:
+                cell.setdefault("n", []).append(word['id'])
+    return [cells[i] for i in sorted(cells)]
 
 class GridGenerator:
-    def __init__(self, size=15):
+    def __init__(self, size=15, bank_file="banque.json", stats_file="stats_mots.json", stats=None):
         self.size = size
+        self.bank_file = bank_file
+        self.stats_file = stats_file
+        self.stats = stats
         self.grid = [[' ' for _ in range(size)] for _ in range(size)]
         self.placed_words = []
+        self.parent = []
+        self.components = 0
+        self.cell_owners = {}
 
     def reset(self):
         self.grid = [[' ' for _ in range(self.size)] for _ in range(self.size)]
         self.placed_words = []
+        self.parent = []
+        self.components = 0
+        self.cell_owners = {}
+
+    def find(self, i):
+        """Racine du groupe de mots connectés contenant le mot d'indice i (union-find)"""
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        self.parent[rb] = ra
+        self.components -= 1
+        return True
+
+    def word_positions(self, word, x, y, dr):
+        if dr == 'horizontal':
+            return [(x + i, y) for i in range(len(word))]
+        return [(x, y + i) for i in range(len(word))]
+
+    def merged_components(self, word, x, y, dr):
+        """Nombre de groupes de mots distincts que relierait ce placement"""
+        roots = set()
+        for pos in self.word_positions(word, x, y, dr):
+            for owner in self.cell_owners.get(pos, ()):
+                roots.add(self.find(owner))
+        return len(roots)
 
     def load_json_file(self, filename, default):
         if os.path.exists(filename) and os.path.getsize(filename) > 0:
@@ -21,6 +132,54 @@ class GridGenerator:
             except: return default
         return default
 
+    def word_stats(self):
+        """Statistiques en mémoire du bot si fournies, sinon lues une fois depuis le fichier"""
+        if self.stats is None:
+            self.stats = WordStats(self.stats_file).load()
+        return self.stats
+
+    def difficulty_weight(self, stats, answer, target):
+        d = stats.difficulty(answer)
+        d = NEUTRAL_DIFFICULTY if d is None else d
+        return math.exp(-((d - target) ** 2) / (2 * DIFFICULTY_SPREAD ** 2)) + 1e-6
+
+    def difficulty_sampler(self, target):
+        """Échantillonneur centré sur la difficulté visée.
+
+        Reconstruit en O(banque) seulement si la banque, la cible ou les statistiques chargées changent ;
+        sinon seuls les mots joués depuis le tirage précédent sont repondérés, en O(log n) chacun.
+        """
+        stats = self.word_stats()
+        changed = stats.take_changes()
+        key = (file_key(self.bank_file), target, stats.generation)
+        sampler = _sampler_cache["sampler"]
+        if _sampler_cache["key"] != key or _sampler_cache["stats"] is not stats:
+            banque = self.load_json_file(self.bank_file, [])
+            index = {}
+            for i, word_pair in enumerate(banque):
+                index.setdefault(word_pair[0].upper(), []).append(i)
+            sampler = FenwickSampler(banque, [self.difficulty_weight(stats, w[0], target) for w in banque])
+            _sampler_cache.update(key=key, stats=stats, sampler=sampler, index=index)
+        else:
+            for answer in changed:
+                for i in _sampler_cache["index"].get(answer, ()):
+                    sampler.update(i, self.difficulty_weight(stats, answer, target))
+        return sampler
+
+    def sample_words(self, target, count, history):
+        """Tire jusqu'à `count` mots distincts hors historique, sans parcourir toute la banque"""
+        sampler = self.difficulty_sampler(target)
+        excluded = set(history)
+        chosen = {}
+        for _ in range(count * 10):
+            if len(chosen) >= count or not len(sampler):
+                break
+            word_pair = sampler.sample()
+            word = word_pair[0].upper()
+            if word not in excluded and word not in chosen:
+                chosen[word] = word_pair
+        return list(chosen.values())
+
     def is_in_bounds(self, x, y):
         return 0 <= x < self.size and 0 <= y < self.size
 
@@ -31,6 +190,11 @@ class GridGenerator:
             if y + len(word) > self.size: return False
 
         has_intersection = False
+        step_x, step_y = (1, 0) if dr == 'horizontal' else (0, 1)
+
+        for end_x, end_y in [(x - step_x, y - step_y), (x + step_x * len(word), y + step_y * len(word))]:
+            if self.is_in_bounds(end_x, end_y) and self.grid[end_y][end_x] != ' ':
+                return False
 
         for i in range(len(word)):
             curr_x = x + i if dr == 'horizontal' else x
@@ -41,33 +205,25 @@ class GridGenerator:
                 return False
 
             if self.grid[curr_y][curr_x] == char:
+                # Une lettre partagée n'est un croisement que si le mot qui l'occupe va dans l'autre sens
+                owners = self.cell_owners.get((curr_x, curr_y), ())
+                if any(self.placed_words[o]['direction'] == dr for o in owners):
+                    return False
                 has_intersection = True
+                continue
 
-            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
+            # Une case vide ne doit pas toucher un mot sur les côtés (les croisements restent possibles)
+            for dx, dy in [(step_y, step_x), (-step_y, -step_x)]:
                 nx, ny = curr_x + dx, curr_y + dy
-                if self.is_in_bounds(nx, ny):
-                    neighbor = self.grid[ny][nx]
-                    if neighbor != ' ' and self.grid[curr_y][curr_x] == ' ':
-                        return False
+                if self.is_in_bounds(nx, ny) and self.grid[ny][nx] != ' ':
+                    return False
 
         if force_no_overlap:
             return True
         return has_intersection or len(self.placed_words) == 0
 
-    def generate(self, nb_words=8, min_words=5):
-        banque = self.load_json_file("banque.json", [])
-        history = self.load_json_file("historique.json", [])
-
-        available = [w for w in banque if w[0].upper() not in history]
-        if len(available) < min_words:
-            print("🔄 Reset historique (Banque vide)")
-            available = list(banque)
-            history = []
-
-        self.reset()
-        random.shuffle(available)
-        available.sort(key=lambda x: len(x[0]), reverse=True)
-
+    def fill(self, available, nb_words):
+        """Place les mots par intersections ; en dernier recours, privilégie une position qui relie des îlots"""
         word_id = 1
         local_history = []
 
@@ -101,26 +257,78 @@ class GridGenerator:
                     break
 
             if not placed:
+                best_position, best_merges = None, -1
                 for _ in range(100):
                     rx = random.randint(0, self.size-1)
                     ry = random.randint(0, self.size-1)
                     rdr = random.choice(['horizontal', 'vertical'])
                     if self.is_in_bounds(rx, ry) and self.can_place(word, rx, ry, rdr, force_no_overlap=True):
-                        self.place_word(word, clue, rx, ry, rdr, word_id)
-                        local_history.append(word)
-                        word_id += 1
-                        placed = True
-                        break
+                        merges = self.merged_components(word, rx, ry, rdr)
+                        if merges > best_merges:
+                            best_position, best_merges = (rx, ry, rdr), merges
+                        if merges >= 2:
+                            break
+                if best_position:
+                    self.place_word(word, clue, *best_position, word_id)
+                    local_history.append(word)
+                    word_id += 1
+        return local_history
+
+    def generate(self, nb_words=8, min_words=5, difficulty=None, max_retries=GENERATION_RETRIES):
+        history = self.load_json_file("historique.json", [])
+        if difficulty is None:
+            banque = self.load_json_file(self.bank_file, [])
+            available = [w for w in banque if w[0].upper() not in history]
+        else:
+            available = self.sample_words(difficulty, nb_words * 4, history)
+        if len(available) < min_words:
+            print("🔄 Reset historique (Banque vide)")
+            if difficulty is None:
+                available = list(banque)
+            else:
+                available = self.sample_words(difficulty, nb_words * 4, [])
+            history = []
+
+        best = None
+        for attempt in range(max_retries + 1):
+            self.reset()
+            random.shuffle(available)
+            available.sort(key=lambda x: len(x[0]), reverse=True)
+            local_history = self.fill(available, nb_words)
+            score = (self.components > 1, -len(self.placed_words), self.components)
+            if best is None or score < best[0]:
+                best = (score, copy.deepcopy(self.grid), copy.deepcopy(self.placed_words),
+                        list(self.parent), self.components, dict(self.cell_owners), local_history)
+            if self.components <= 1:
+                break
+            if attempt < max_retries:
+                print(f"🔁 Grille en {self.components} îlots, nouvel essai ({attempt + 1}/{max_retries})")
+        _, self.grid, self.placed_words, self.parent, self.components, self.cell_owners, local_history = best
+        if self.components > 1:
+            print(f"⚠️ Toujours {self.components} îlots après {max_retries} nouveaux essais : grille conservée telle quelle")
 
         history_strings = [h for h in history if isinstance(h, str)]
         new_history = list(set(history_strings + local_history))
+        grid = {"grid_id": uuid.uuid4().hex[:12], "size": self.size, "words": self.placed_words,
+                "cells": self.cell_table()}
         with open("grille_exemple.json", "w", encoding="utf-8") as f:
-            json.dump({"words": self.placed_words}, f, indent=2, ensure_ascii=False)
+            json.dump(grid, f, indent=2, ensure_ascii=False)
         with open("historique.json", "w", encoding="utf-8") as f:
             json.dump(new_history, f, indent=2, ensure_ascii=False)
-        print(f"✅ Grille générée avec {len(self.placed_words)} mots.")
+        print(f"✅ Grille générée avec {len(self.placed_words)} mots ({self.components} îlot(s)).")
+
+    def cell_table(self):
+        return build_cell_table(self.placed_words, self.size)
 
     def place_word(self, word, clue, x, y, dr, wid):
+        index = len(self.placed_words)
+        self.parent.append(index)
+        self.components += 1
+        for pos in self.word_positions(word, x, y, dr):
+            owners = self.cell_owners.setdefault(pos, [])
+            for owner in owners:
+                self.union(owner, index)
+            owners.append(index)
         for i in range(len(word)):
             if dr == 'horizontal': self.grid[y][x+i] = word[i]
             else: self.grid[y+i][x] = word[i]
@@ -0,0 +1,178 @@
+import json
+import os
+import time
+from collections import Counter, defaultdict, deque
+
+class Leaderboard:
+    """Journal append-only des mots trouvés et classements maintenus au fil de l'eau.
+
+    Chaque résolution est ajoutée en fin de segment (`segment-000001.jsonl`, ...).
+    Les segments fermés sont compactés dans `snapshot.json`, qui contient déjà les
+    agrégats : au démarrage, seul le segment courant est rejoué.
+    """
+
+    def __init__(self, directory='solves', segment_size=5000, window=7 * 24 * 3600, session=None):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.window = window
+        self.session = session or time.strftime('%Y%m%d-%H%M%S')
+        self.reset()
+
+    def reset(self):
+        self.grids = defaultdict(Counter)
+        self.sessions = defaultdict(Counter)
+        self.recent = deque()
+        self.recent_totals = Counter()
+        self.segment = 1
+        self.segment_lines = 0
+
+    def segment_path(self, number):
+        return os.path.join(self.directory, f"segment-{number:06d}.jsonl")
+
+    def snapshot_path(self):
+        return os.path.join(self.directory, "snapshot.json")
+
+    def segment_numbers(self):
+        if not os.path.isdir(self.directory):
+            return []
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.startswith("segment-") and name.endswith(".jsonl"):
+                try: numbers.append(int(name[8:-6]))
+                except ValueError: continue
+        return sorted(numbers)
+
+    def apply(self, entry):
+        """Met à jour les agrégats avec une entrée du journal"""
+        user, pts = entry['user'], entry['pts']
+        self.grids[entry['grid']][user] += pts
+        self.sessions[entry['session']][user] += pts
+        self.recent.append((entry['ts'], user, pts))
+        self.recent_totals[user] += pts
+
+    def expire(self, now=None):
+        """Retire de la fenêtre glissante les résolutions trop anciennes"""
+        limit = (now if now is not None else time.time()) - self.window
+        while self.recent and self.recent[0][0] < limit:
+            _, user, pts = self.recent.popleft()
+            self.recent_totals[user] -= pts
+            if self.recent_totals[user] <= 0:
+                del self.recent_totals[user]
+
+    def record(self, user, grid_id, word_id, points, ts=None):
+        entry = {
+            "user": user.lower(), "grid": str(grid_id), "word": word_id,
+            "ts": ts if ts is not None else time.time(), "pts": points,
+            "session": self.session
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.segment_path(self.segment), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n")
+        self.segment_lines += 1
+        self.apply(entry)
+        self.expire(entry['ts'])
+        if self.segment_lines >= self.segment_size:
+            self.rotate()
+        return entry
+
+    def replay(self, number):
+        lines = 0
+        with open(self.segment_path(number), 'r', encoding='utf-8') as f:
+            for line in f:
+                try: entry = json.loads(line)
+                except ValueError: continue
+                self.apply(entry)
+                lines += 1
+        return lines
+
+    def load(self):
+        """Recharge le snapshot puis rejoue les segments qui n'y sont pas encore"""
+        self.reset()
+        last_compacted = 0
+        if os.path.exists(self.snapshot_path()):
+            try:
+                with open(self.snapshot_path(), 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                last_compacted = snapshot['last_segment']
+                for grid_id, totals in snapshot['grids'].items():
+                    self.grids[grid_id].update(totals)
+                for session, totals in snapshot['sessions'].items():
+                    self.sessions[session].update(totals)
+                for ts, user, pts in snapshot['recent']:
+                    self.recent.append((ts, user, pts))
+                    self.recent_totals[user] += pts
+            except Exception as e:
+                print(f"❌ Erreur lecture snapshot classement : {e}")
+                self.reset()
+                last_compacted = 0
+
+        numbers = [n for n in self.segment_numbers() if n > last_compacted]
+        self.segment = numbers[-1] if numbers else last_compacted + 1
+        if len(numbers) > 1:
+            for number in numbers[:-1]:
+                self.replay(number)
+            self.compact()
+        if numbers:
+            self.segment_lines = self.replay(self.segment)
+        self.expire()
+        if self.segment_lines >= self.segment_size:
+            self.rotate()
+
+    def state(self):
+        """Agrégats et position dans le journal en données simples, pour la reprise à chaud"""
+        return {
+            "session": self.session, "segment": self.segment, "segment_lines": self.segment_lines,
+            "grids": {g: dict(t) for g, t in self.grids.items()},
+            "sessions": {s: dict(t) for s, t in self.sessions.items()},
+            "recent": [list(r) for r in self.recent],
+            "recent_totals": dict(self.recent_totals),
+        }
+
+    def restore(self, state):
+        """Inverse de `state()` : reprend les agrégats sans relire le journal"""
+        self.reset()
+        self.session = state["session"]
+        self.segment, self.segment_lines = state["segment"], state["segment_lines"]
+        for grid_id, totals in state["grids"].items():
+            self.grids[grid_id].update(totals)
+        for session, totals in state["sessions"].items():
+            self.sessions[session].update(totals)
+        self.recent.extend(tuple(r) for r in state["recent"])
+        self.recent_totals.update(state["recent_totals"])
+
+    def rotate(self):
+        self.segment += 1
+        self.segment_lines = 0
+        self.compact()
+
+    def compact(self):
+        """Résume les segments fermés dans le snapshot puis les supprime.
+
+        Appelée quand les agrégats ne contiennent aucune entrée du segment courant :
+        ils décrivent alors exactement le snapshot à écrire.
+        """
+        self.expire()
+        snapshot = {
+            "last_segment": self.segment - 1,
+            "grids": {g: dict(t) for g, t in self.grids.items()},
+            "sessions": {s: dict(t) for s, t in self.sessions.items()},
+            "recent": [list(r) for r in self.recent]
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.snapshot_path() + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.snapshot_path())
+        for number in self.segment_numbers():
+            if number < self.segment:
+                os.remove(self.segment_path(number))
+
+    def top_grid(self, grid_id, n=5):
+        return self.grids.get(str(grid_id), Counter()).most_common(n)
+
+    def top_session(self, n=5, session=None):
+        return self.sessions.get(session or self.session, Counter()).most_common(n)
+
+    def top_window(self, n=5, now=None):
+        self.expire(now)
+        return self.recent_totals.most_common(n)
@@ -1,22 +1,231 @@
 import os
 import json
 import asyncio
-import websockets
+import hashlib
 import random
+import signal
+import time
+import unicodedata
+from collections import deque
 from dotenv import load_dotenv
 from twitchio.ext import commands
-from generator import GridGenerator
+from generator import GridGenerator, build_cell_table, file_key
+from leaderboard import Leaderboard
+from word_stats import WordStats
+from replay import ChatRecorder
 
 load_dotenv()
 
 TOKEN = os.getenv('TWITCH_TOKEN')
 CHANNEL = os.getenv('TWITCH_CHANNEL')
 WS_PORT = 8765
+WS_COMPRESSION = os.getenv('WS_COMPRESSION', 'deflate')
+WS_BACKLOG = 1024
+HTTP_PORT = int(os.getenv('HTTP_PORT', '0'))
+HTTP_TOP = 10
+SSE_BUFFER = 256
+SSE_QUEUE = 256
+SSE_HEARTBEAT = 15
 SCORES_FILE = 'scores.json'
+ANSWER_ONLY_MODE = os.getenv('ANSWER_ONLY_MODE', '0') == '1'
+CHAT_GUESSES = os.getenv('CHAT_GUESSES', '0') == '1'
+MAX_GUESS_LENGTH = 64
+HINT_INTERVAL = int(os.getenv('HINT_INTERVAL', '0'))
+SOLVES_DIR = 'solves'
+STATS_FILE = 'stats_mots.json'
+GRID_DIFFICULTY = float(os.environ['GRID_DIFFICULTY']) if os.getenv('GRID_DIFFICULTY') else None
+DIFFICULTY_LEVELS = {'facile': 0.2, 'moyen': 0.5, 'difficile': 0.8}
+BASE_POINTS = 10
+MIN_POINTS = 2
+POINTS_HALF_LIFE = 120
+FIRST_SOLVE_BONUS = 5
+STREAK_STEP = 0.25
+STREAK_MAX = 2.0
+LEADERBOARD_WINDOW = 7 * 24 * 3600
+RECORD_FILE = os.getenv('RECORD_FILE')
+SNAPSHOT_FILE = os.getenv('SNAPSHOT_FILE', 'reprise.json')
+SNAPSHOT_VERSION = 2
 
 current_filename = 'grille_exemple.json'
 current_grid = {}
 connected_clients = set()
+answer_index = {}
+cell_index = {}
+cell_letters = {}
+clock = time.monotonic
+last_progress = clock()
+leaderboard = Leaderboard(SOLVES_DIR, window=LEADERBOARD_WINDOW)
+word_stats = WordStats(STATS_FILE)
+word_available_at = {}
+solves_in_grid = 0
+streak = {"user": None, "count": 0}
+scores_cache = {"key": None, "scores": {}}
+grid_version = 0
+init_cache = {"key": None, "payload": None}
+recorder = None
+broadcast_seq = 0
+scores_version = 0
+http_cache = {}
+event_log = deque(maxlen=SSE_BUFFER)
+sse_clients = set()
+web = None  # aiohttp.web, importé par create_http_app()
+
+def normalize_answer(text):
+    """Met une réponse sous forme canonique : majuscules, sans accents ni séparateurs"""
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in text if c.isalnum()).upper()
+
+def rebuild_answer_index():
+    """Indexe les réponses non résolues de la grille courante par forme normalisée"""
+    answer_index.clear()
+    for word in current_grid.get('words', []):
+        if not word.get('solved', False):
+            answer_index[normalize_answer(word['answer'])] = word
+
+def find_unsolved_word(guess):
+    """Retrouve en O(1) le mot non résolu correspondant à une proposition, sinon None"""
+    if len(guess) > MAX_GUESS_LENGTH:
+        return None
+    return answer_index.get(normalize_answer(guess))
+
+def grid_size(grid):
+    """Taille de la grille, déduite de l'emprise des mots pour les anciens fichiers"""
+    if 'size' in grid:
+        return grid['size']
+    extent = 0
+    for word in grid.get('words', []):
+        end_x = word['x'] + (len(word['answer']) if word['direction'] == 'horizontal' else 1)
+        end_y = word['y'] + (len(word['answer']) if word['direction'] == 'vertical' else 1)
+        extent = max(extent, end_x, end_y)
+    return extent
+
+def prepare_grid_state():
+    """Complète la grille courante : taille, table des cases et bitmap des cases révélées"""
+    size = grid_size(current_grid)
+    current_grid['size'] = size
+    words = current_grid.get('words', [])
+    if 'cells' not in current_grid or any('cells' not in w for w in words):
+        current_grid['cells'] = build_cell_table(words, size)
+    cell_index.clear()
+    cell_letters.clear()
+    for cell in current_grid['cells']:
+        cell_index[cell['i']] = cell
+    for word in words:
+        for i, letter in zip(word['cells'], word['answer'].upper()):
+            cell_letters[i] = letter
+
+    revealed = current_grid.get('revealed')
+    if not isinstance(revealed, str) or len(revealed) != size * size:
+        current_grid['revealed'] = '0' * (size * size)
+    visible = [i for i in cell_index if current_grid['revealed'][i] == '1']
+    for word in words:
+        if word.get('solved', False):
+            visible.extend(word['cells'])
+    reveal_cells(visible)
+
+def reveal_cells(indices):
+    """Rend visibles les cases données (bit et lettre) ; renvoie celles qui étaient encore cachées"""
+    bits = bytearray(current_grid['revealed'], 'ascii')
+    changed = [i for i in indices if bits[i] == ord('0')]
+    for i in indices:
+        bits[i] = ord('1')
+        if i in cell_index:
+            cell_index[i]['l'] = cell_letters[i]
+    current_grid['revealed'] = bits.decode('ascii')
+    return changed
+
+def word_progress(word):
+    """Nombre de lettres déjà visibles d'un mot, cases partagées comprises"""
+    revealed = current_grid['revealed']
+    return sum(1 for i in word['cells'] if revealed[i] == '1'), len(word['cells'])
+
+def pick_hint(word_id=None):
+    """Choisit une case cachée d'un mot non résolu, en laissant au moins une lettre à trouver"""
+    revealed = current_grid['revealed']
+    choices = []
+    for word in current_grid.get('words', []):
+        if word.get('solved', False):
+            continue
+        if word_id is not None and str(word['id']) != str(word_id):
+            continue
+        hidden = [(i, k) for k, i in enumerate(word['cells']) if revealed[i] == '0']
+        if len(hidden) >= 2:
+            choices.append((word, hidden))
+    if not choices:
+        return None
+    word, hidden = random.choice(choices)
+    index, position = random.choice(hidden)
+    return word, index, word['answer'][position].upper()
+
+async def give_hint(word_id=None):
+    """Révèle une lettre et envoie à l'overlay uniquement la case modifiée"""
+    global last_progress
+    if 'revealed' not in current_grid:
+        prepare_grid_state()
+        grid_changed()
+    hint = pick_hint(word_id)
+    if hint is None:
+        return None
+    word, index, letter = hint
+    reveal_cells([index])
+    last_progress = clock()
+    grid_changed()
+    save_grid()
+    await broadcast_update({"type": "CELL_REVEALED", "cells": [[index, letter]]})
+    return hint
+
+def grid_changed():
+    """Invalide le message INIT en cache après un mot trouvé, un indice ou une nouvelle grille"""
+    global grid_version
+    grid_version += 1
+
+def client_grid():
+    """Vue de la grille pour les clients : sans les réponses, seules les lettres découvertes (l) circulent"""
+    words = [{k: v for k, v in word.items() if k != 'answer'} for word in current_grid.get('words', [])]
+    return {**current_grid, "words": words}
+
+def init_payload():
+    """Message INIT sérialisé une seule fois par version de grille"""
+    key = (grid_version, id(current_grid))
+    if init_cache["key"] != key:
+        init_cache["payload"] = json.dumps({"type": "INIT", "grid": client_grid()})
+        init_cache["key"] = key
+    return init_cache["payload"]
+
+def scores_changed():
+    """Invalide les classements servis en HTTP après un mot trouvé"""
+    global scores_version
+    scores_version += 1
+
+def current_grid_id():
+    return current_grid.get('grid_id', current_filename)
+
+def start_word_timers():
+    """Horodate la mise à disposition des mots et remet à zéro première résolution et séries"""
+    global solves_in_grid
+    now = clock()
+    word_available_at.clear()
+    solves_in_grid = 0
+    for word in current_grid.get('words', []):
+        if word.get('solved', False):
+            solves_in_grid += 1
+        else:
+            word_available_at[word['id']] = now
+    streak["user"], streak["count"] = None, 0
+
+def compute_points(elapsed, first=False, streak_count=1):
+    """Points décroissants avec le temps de résolution, bonus du premier mot et multiplicateur de série"""
+    decay = 0.5 ** (max(elapsed, 0) / POINTS_HALF_LIFE)
+    points = MIN_POINTS + (BASE_POINTS - MIN_POINTS) * decay
+    points *= min(1 + STREAK_STEP * (streak_count - 1), STREAK_MAX)
+    if first:
+        points += FIRST_SOLVE_BONUS
+    return round(points)
+
+def record_new_grid():
+    """Compte l'apparition de chaque mot d'une grille neuve dans les statistiques"""
+    for word in current_grid.get('words', []):
+        word_stats.record_shown(word['answer'])
 
 def load_grid(filename):
     global current_grid, current_filename
@@ -26,6 +235,10 @@ def load_grid(filename):
         with open(filename, 'r', encoding='utf-8') as f:
             current_grid = json.load(f)
         current_filename = filename
+        prepare_grid_state()
+        rebuild_answer_index()
+        start_word_timers()
+        grid_changed()
         print(f"Grille chargée : {current_filename}")
         return True
     except Exception as e:
@@ -39,44 +252,355 @@ def save_grid():
     except Exception as e:
         print(f"❌ Erreur sauvegarde : {e}")
 
-def update_score(user_name, points=10):
-    scores = {}
-    if os.path.exists(SCORES_FILE):
+def load_scores():
+    """Scores en mémoire, relus uniquement si le fichier a changé depuis le dernier accès"""
+    try:
+        stat = os.stat(SCORES_FILE)
+    except OSError:
+        return {}
+    key = (SCORES_FILE, stat.st_mtime_ns, stat.st_size)
+    if scores_cache["key"] != key:
         with open(SCORES_FILE, 'r', encoding='utf-8') as f:
             try: scores = json.load(f)
             except: scores = {}
+        scores_cache["key"], scores_cache["scores"] = key, scores
+    return scores_cache["scores"]
+
+def update_score(user_name, points=10):
+    scores = load_scores()
 
     user_name = user_name.lower()
     scores[user_name] = scores.get(user_name, 0) + points
 
     with open(SCORES_FILE, 'w', encoding='utf-8') as f:
         json.dump(scores, f, indent=2, ensure_ascii=False)
+    stat = os.stat(SCORES_FILE)
+    scores_cache["key"], scores_cache["scores"] = (SCORES_FILE, stat.st_mtime_ns, stat.st_size), scores
     return scores[user_name]
 
 async def broadcast_update(data):
+    """Numérote chaque évènement (seq) ; le flux SSE s'en sert d'identifiant pour la reprise par Last-Event-ID"""
+    global broadcast_seq
+    broadcast_seq += 1
+    msg = json.dumps({**data, "seq": broadcast_seq})
+    publish_event(sse_frame(broadcast_seq, data["type"], msg), broadcast_seq)
+    if connected_clients:
+        await broadcast_message(msg)
+
+async def broadcast_grid():
+    """Envoie la nouvelle grille aux overlays et aux flux SSE.
+
+    Pour le SSE, la grille reçoit son propre seq et ouvre le tampon vidé : toute reprise
+    antérieure au changement de grille commence donc par la grille complète.
+    """
+    global broadcast_seq
+    await broadcast_message(init_payload())
+    broadcast_seq += 1
+    event_log.clear()
+    publish_event(sse_frame(broadcast_seq, "INIT", init_payload()), broadcast_seq)
+
+def sse_frame(seq, kind, data):
+    return f"id: {seq}\nevent: {kind}\ndata: {data}\n\n".encode('utf-8')
+
+def publish_event(frame, seq=None):
+    """Garde l'évènement pour les reconnexions (Last-Event-ID) et le pousse aux flux SSE ouverts"""
+    if seq is not None:
+        event_log.append((seq, frame))
+    for queue in list(sse_clients):
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Client trop lent : il sera déconnecté et se resynchronisera à la reconnexion
+            sse_clients.discard(queue)
+
+def sse_backlog(last_id):
+    """Évènements manqués depuis last_id, ou la grille complète si le tampon ne suffit pas"""
+    if last_id == broadcast_seq:
+        return []
+    if last_id is not None and last_id < broadcast_seq and event_log and event_log[0][0] <= last_id + 1:
+        return [frame for seq, frame in event_log if seq > last_id]
+    return [sse_frame(broadcast_seq, "INIT", init_payload())]
+
+async def broadcast_message(msg):
+    """Envoie un message déjà sérialisé à tous les overlays connectés"""
     if connected_clients:
-        msg = json.dumps(data)
         await asyncio.gather(*[client.send(msg) for client in connected_clients], return_exceptions=True)
 
 async def websocket_handler(websocket):
     connected_clients.add(websocket)
     try:
-        await websocket.send(json.dumps({"type": "INIT", "grid": current_grid}))
+        await websocket.send(init_payload())
         async for message in websocket: pass
     finally:
         connected_clients.remove(websocket)
 
+def top_scores(period):
+    """Classement demandé, None si la période est inconnue"""
+    if period == 'grille':
+        return leaderboard.top_grid(current_grid_id(), HTTP_TOP)
+    if period == 'session':
+        return leaderboard.top_session(HTTP_TOP)
+    if period == 'semaine':
+        return leaderboard.top_window(HTTP_TOP)
+    if period == 'total':
+        return sorted(load_scores().items(), key=lambda x: x[1], reverse=True)[:HTTP_TOP]
+    return None
+
+def cached_body(name, key, build):
+    """Corps HTTP sérialisé et son ETag, recalculés seulement quand la clé de version change"""
+    entry = http_cache.get(name)
+    if entry is None or entry[0] != key:
+        body = build().encode('utf-8')
+        entry = (key, '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"', body)
+        http_cache[name] = entry
+    return entry[1], entry[2]
+
+def http_response(request, etag, body):
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Access-Control-Allow-Origin": "*"}
+    if_none_match = [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]
+    if etag in if_none_match or '*' in if_none_match:
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=body, headers=headers, content_type='application/json', charset='utf-8')
+
+async def http_grille(request):
+    """GET /grille : le message INIT en cache, 304 tant que la grille n'a pas changé"""
+    etag, body = cached_body('grille', (grid_version, id(current_grid)), init_payload)
+    return http_response(request, etag, body)
+
+async def http_classement(request):
+    """GET /classement?periode=total|grille|session|semaine, versionné par les mots trouvés"""
+    period = request.query.get('periode', 'total')
+    if period not in ('total', 'grille', 'session', 'semaine'):
+        return web.json_response({"erreur": f"période inconnue : {period}"}, status=400)
+    key = [scores_version, current_grid_id() if period == 'grille' else None]
+    if period == 'semaine':
+        # La fenêtre glissante évolue sans nouvelle résolution
+        leaderboard.expire()
+        key.append(len(leaderboard.recent))
+    etag, body = cached_body('classement-' + period, tuple(key),
+                             lambda: json.dumps({"periode": period, "classement": top_scores(period)}, ensure_ascii=False))
+    return http_response(request, etag, body)
+
+async def http_evenements(request):
+    """GET /evenements : flux SSE des évènements de l'overlay, reprise possible via Last-Event-ID"""
+    try:
+        last_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_id = None
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache",
+                                           "Access-Control-Allow-Origin": "*"})
+    await response.prepare(request)
+    queue = asyncio.Queue(maxsize=SSE_QUEUE)
+    sse_clients.add(queue)
+    try:
+        await response.write(b"retry: 3000\n\n" + b"".join(sse_backlog(last_id)))
+        while queue in sse_clients:
+            try:
+                frame = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT)
+            except asyncio.TimeoutError:
+                frame = b": ping\n\n"
+            await response.write(frame)
+    except ConnectionResetError:
+        pass
+    finally:
+        sse_clients.discard(queue)
+    return response
+
+def create_http_app():
+    """Application aiohttp ; le module n'est importé qu'ici, quand la lecture HTTP est activée"""
+    global web
+    from aiohttp import web
+    app = web.Application()
+    app.router.add_get('/grille', http_grille)
+    app.router.add_get('/classement', http_classement)
+    app.router.add_get('/evenements', http_evenements)
+    return app
+
+async def start_http_server(host="localhost", port=None):
+    """Surface HTTP en lecture seule à côté du serveur WebSocket"""
+    app = create_http_app()
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port or HTTP_PORT).start()
+    return runner
+
+async def solve_word(channel, user_name, word):
+    """Marque un mot comme trouvé, crédite le joueur et prévient chat et overlay"""
+    global last_progress, solves_in_grid
+    now = clock()
+    elapsed = now - word_available_at.pop(word['id'], now)
+    if streak["user"] == user_name.lower():
+        streak["count"] += 1
+    else:
+        streak["user"], streak["count"] = user_name.lower(), 1
+    points = compute_points(elapsed, first=solves_in_grid == 0, streak_count=streak["count"])
+    solves_in_grid += 1
+
+    word['solved'] = True
+    answer_index.pop(normalize_answer(word['answer']), None)
+    if 'revealed' in current_grid:
+        reveal_cells(word['cells'])
+    last_progress = now
+    grid_changed()
+    save_grid()
+    new_total = update_score(user_name, points)
+    leaderboard.record(user_name, current_grid_id(), word['id'], points)
+    scores_changed()
+    word_stats.record_solve(word['answer'], elapsed)
+    bonus = f" 🔥 Série x{streak['count']}" if streak["count"] > 1 else ""
+    await channel.send(f"✅ @{user_name} ! +{points} pts en {elapsed:.0f}s (Total: {new_total}){bonus}")
+
+    await broadcast_update({
+        "type": "WORD_SOLVED",
+        "word_id": word['id'],
+        "answer": word['answer'].upper(),
+        "cells": [[i, letter] for i, letter in zip(word.get('cells', []), word['answer'].upper())],
+        "user": user_name,
+        "points": points
+    })
+    if all(w.get('solved', False) for w in current_grid['words']):
+        word_stats.save()
+        await channel.send("🏆 Grille terminée ! GG la team !")
+        await broadcast_update({"type": "VICTORY"})
+
+async def chat_guess(channel, user_name, content):
+    """Proposition libre dans le chat (CHAT_GUESSES) : résout le mot s'il existe, silence sinon"""
+    word = find_unsolved_word(content)
+    if word:
+        await solve_word(channel, user_name, word)
+
+async def hint_loop():
+    """Révèle automatiquement une lettre quand la grille stagne depuis HINT_INTERVAL secondes"""
+    while True:
+        await asyncio.sleep(HINT_INTERVAL)
+        if clock() - last_progress >= HINT_INTERVAL:
+            hint = await give_hint()
+            if hint:
+                print(f"💡 Indice automatique : mot n°{hint[0]['id']}")
+
 def get_top_5():
     if not os.path.exists(SCORES_FILE):
         return []
     try:
-        with open(SCORES_FILE, 'r', encoding='utf-8') as f:
-            scores = json.load(f)
+        scores = load_scores()
         sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
         return sorted_scores[:5]
     except:
         return []
 
+def save_snapshot(filename=SNAPSHOT_FILE):
+    """Fige l'état du jeu en mémoire (grille, index, scores, classements, minuteries) en JSON dans un seul fichier.
+
+    Uniquement des données simples : les objets sont recréés par le code en place au redémarrage.
+    """
+    now = clock()
+    valid_payload = init_cache["key"] == (grid_version, id(current_grid))
+    state = {
+        "version": SNAPSHOT_VERSION,
+        "grid_key": file_key(current_filename),
+        "segment_key": file_key(leaderboard.segment_path(leaderboard.segment)),
+        "current_filename": current_filename,
+        "current_grid": current_grid,
+        "answer_index": [[answer, word['id']] for answer, word in answer_index.items()],
+        "cell_letters": [[i, letter] for i, letter in cell_letters.items()],
+        "word_ages": [[word_id, now - t] for word_id, t in word_available_at.items()],
+        "progress_age": now - last_progress,
+        "solves_in_grid": solves_in_grid,
+        "streak": streak,
+        "scores_cache": scores_cache,
+        "leaderboard": leaderboard.state(),
+        "word_stats": word_stats.state(),
+        "grid_version": grid_version,
+        "init_payload": init_cache["payload"] if valid_payload else None,
+        "broadcast_seq": broadcast_seq,
+    }
+    try:
+        with open(filename + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(filename + '.tmp', filename)
+        return True
+    except Exception as e:
+        print(f"❌ Erreur sauvegarde reprise : {e}")
+        return False
+
+def same_key(saved, key):
+    return (tuple(saved) if saved is not None else None) == key
+
+def restore_snapshot(filename=SNAPSHOT_FILE):
+    """Reprend l'état figé au dernier arrêt sans renormaliser les réponses ni rejouer le journal.
+
+    Renvoie False si le fichier est absent, d'une autre version ou périmé. Il est consommé :
+    après un arrêt brutal, le démarrage suivant repart du disque.
+    """
+    global current_grid, current_filename, last_progress, solves_in_grid, grid_version, broadcast_seq
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        os.remove(filename)
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        print(f"❌ Erreur lecture reprise : {e}")
+        return False
+    if not isinstance(state, dict) or state.get("version") != SNAPSHOT_VERSION:
+        print("⚠️ Reprise ignorée : format d'une autre version")
+        return False
+    try:
+        stale = (not same_key(state["grid_key"], file_key(state["current_filename"]))
+                 or not same_key(state["segment_key"],
+                                 file_key(leaderboard.segment_path(state["leaderboard"]["segment"]))))
+    except Exception as e:
+        print(f"❌ Reprise inutilisable : {e}")
+        return False
+    if stale:
+        print("⚠️ Reprise ignorée : grille ou journal modifiés depuis l'arrêt")
+        return False
+
+    try:
+        now = clock()
+        current_grid, current_filename = state["current_grid"], state["current_filename"]
+        words = {word['id']: word for word in current_grid.get('words', [])}
+        answer_index.clear()
+        answer_index.update({answer: words[word_id] for answer, word_id in state["answer_index"]})
+        cell_index.clear()
+        cell_index.update({cell['i']: cell for cell in current_grid.get('cells', [])})
+        cell_letters.clear()
+        cell_letters.update({i: letter for i, letter in state["cell_letters"]})
+        word_available_at.clear()
+        word_available_at.update({word_id: now - age for word_id, age in state["word_ages"]})
+        last_progress = now - state["progress_age"]
+        solves_in_grid = state["solves_in_grid"]
+        streak.update(state["streak"])
+        scores = state["scores_cache"]
+        scores_cache["key"] = tuple(scores["key"]) if scores["key"] is not None else None
+        scores_cache["scores"] = scores["scores"]
+        leaderboard.restore(state["leaderboard"])
+        word_stats.restore(state["word_stats"])
+        grid_version, broadcast_seq = state["grid_version"], state["broadcast_seq"]
+        if state["init_payload"] is not None:
+            init_cache["key"], init_cache["payload"] = (grid_version, id(current_grid)), state["init_payload"]
+    except Exception as e:
+        # Chargement complet depuis le disque derrière, qui écrase tout état partiel
+        print(f"❌ Reprise inutilisable : {e}")
+        return False
+    return True
+
+def load_state():
+    """État de départ : reprise à chaud si possible, sinon grille, classements et statistiques relus du disque"""
+    if restore_snapshot():
+        print(f"⚡ Reprise à chaud : {current_filename} ({solves_in_grid}/{len(current_grid.get('words', []))} mots trouvés)")
+        return True
+    leaderboard.load()
+    word_stats.load()
+    if not load_grid('grille_exemple.json'):
+        print("📝 Aucune grille trouvée, génération d'une nouvelle grille...")
+        gen = GridGenerator(size=15, stats_file=STATS_FILE, stats=word_stats)
+        gen.generate(nb_words=8, min_words=5, difficulty=GRID_DIFFICULTY)
+        load_grid('grille_exemple.json')
+        record_new_grid()
+        print("✅ Grille par défaut générée et chargée")
+    return False
+
 class Bot(commands.Bot):
     def __init__(self):
         super().__init__(token=TOKEN, prefix='!', initial_channels=[CHANNEL])
@@ -84,12 +608,26 @@ class Bot(commands.Bot):
     async def event_ready(self):
         print(f"✅ Bot Twitch connecté : {self.nick}")
         print(f"🚀 Serveur WebSocket sur le port {WS_PORT}")
+        if HTTP_PORT:
+            print(f"🌍 Lecture HTTP/SSE sur le port {HTTP_PORT} (/grille, /classement, /evenements)")
+
+    async def event_message(self, message):
+        if message.echo:
+            return
+        if recorder:
+            recorder.record_message(message.author.name, message.content, chat_guesses=CHAT_GUESSES)
+        if CHAT_GUESSES and not message.content.startswith('!'):
+            await chat_guess(message.channel, message.author.name, message.content)
+            return
+        await self.handle_commands(message)
 
     async def event_command_error(self, ctx: commands.Context, error):
         """Gestionnaire d'erreurs pour les commandes"""
         from twitchio.ext.commands.errors import MissingRequiredArgument, BadArgument
         if isinstance(error, MissingRequiredArgument):
-            if ctx.command.name == 'mf':
+            if ctx.command.name == 'mf' and ANSWER_ONLY_MODE:
+                await ctx.send(f"❓ @{ctx.author.name}, utilise : !mf <réponse> ou !mf <numéro> <réponse> (ex: !mf PYTHON)")
+            elif ctx.command.name == 'mf':
                 await ctx.send(f"❓ @{ctx.author.name}, utilise : !mf <numéro> <réponse> (ex: !mf 1 PYTHON)")
             else:
                 await ctx.send(f"❓ @{ctx.author.name}, arguments manquants pour !{ctx.command.name}")
@@ -100,49 +638,76 @@ class Bot(commands.Bot):
             print(f"Erreur commande non gérée: {error}")
 
     @commands.command(name='mf')
-    async def mot_fleche(self, ctx: commands.Context, num: int, guess: str):
-        guess = guess.upper()
+    async def mot_fleche(self, ctx: commands.Context, num: str, guess: str = None):
+        if guess is None:
+            if not ANSWER_ONLY_MODE:
+                raise commands.MissingRequiredArgument(argname='guess')
+            word = find_unsolved_word(num)
+            if word:
+                await solve_word(ctx, ctx.author.name, word)
+            else:
+                await ctx.send(f"❌ Non @{ctx.author.name}, ce n'est pas ça.")
+            return
+
+        if not num.isdecimal():
+            raise commands.BadArgument(f"numéro invalide : {num}", argname='num')
+        word_id = int(num)
         for word in current_grid.get('words', []):
-            if str(word['id']) == str(num):
+            if word['id'] == word_id:
                 if word.get('solved', False): return
-                if word['answer'].upper() == guess:
-                    word['solved'] = True
-                    save_grid()
-                    new_total = update_score(ctx.author.name)
-                    await ctx.send(f"✅ @{ctx.author.name} ! +10 pts (Total: {new_total})")
-
-                    await broadcast_update({
-                        "type": "WORD_SOLVED",
-                        "word_id": num,
-                        "answer": guess,
-                        "user": ctx.author.name
-                    })
-                    if all(w.get('solved', False) for w in current_grid['words']):
-                        await ctx.send("🏆 Grille terminée ! GG la team !")
-                        await broadcast_update({"type": "VICTORY"})
+                if normalize_answer(word['answer']) == normalize_answer(guess):
+                    await solve_word(ctx, ctx.author.name, word)
                 else:
+                    word_stats.record_wrong(word['answer'])
                     await ctx.send(f"❌ Non @{ctx.author.name}, ce n'est pas ça.")
                 return
 
     @commands.command(name='reset_grille')
-    async def reset_grille(self, ctx: commands.Context):
+    async def reset_grille(self, ctx: commands.Context, level: str = None):
         if ctx.author.name.lower() != CHANNEL.lower(): return
         await ctx.send("⚙️ Génération d'une nouvelle grille...")
-        gen = GridGenerator(size=15)
-        gen.generate(nb_words=8, min_words=5)
+        word_stats.save()
+        gen = GridGenerator(size=15, stats_file=STATS_FILE, stats=word_stats)
+        gen.generate(nb_words=8, min_words=5, difficulty=DIFFICULTY_LEVELS.get(level, GRID_DIFFICULTY))
 
         if load_grid('grille_exemple.json'):
-            await broadcast_update({"type": "INIT", "grid": current_grid})
+            record_new_grid()
+            if recorder:
+                recorder.record_grid(current_grid)
+            await broadcast_grid()
             await ctx.send("✅ Nouvelle grille chargée !")
 
+    @commands.command(name='indice')
+    async def indice(self, ctx: commands.Context, num: str = None):
+        if ctx.author.name.lower() != CHANNEL.lower(): return
+        hint = await give_hint(num)
+        if hint is None:
+            await ctx.send("💡 Aucune lettre à révéler pour le moment.")
+            return
+        word, _, letter = hint
+        shown, total = word_progress(word)
+        await ctx.send(f"💡 Indice pour le n°{word['id']} : un {letter} ! ({shown}/{total} lettres visibles)")
+
     @commands.command(name='classement')
-    async def classement(self, ctx: commands.Context):
-        top = get_top_5()
+    async def classement(self, ctx: commands.Context, period: str = None):
+        titles = {
+            'grille': "🏆 TOP 5 DE LA GRILLE : ",
+            'session': "🏆 TOP 5 DU LIVE : ",
+            'semaine': "🏆 TOP 5 DE LA SEMAINE : ",
+        }
+        if period == 'grille':
+            top = leaderboard.top_grid(current_grid_id())
+        elif period == 'session':
+            top = leaderboard.top_session()
+        elif period == 'semaine':
+            top = leaderboard.top_window()
+        else:
+            top = get_top_5()
         if not top:
             await ctx.send("📊 Aucun score enregistré pour le moment.")
             return
 
-        message = "🏆 TOP 5 CLASSEMENT : "
+        message = titles.get(period, "🏆 TOP 5 CLASSEMENT : ")
         entries = [f"{i+1}. {user} ({pts}pts)" for i, (user, pts) in enumerate(top)]
         await ctx.send(message + " | ".join(entries))
 
@@ -151,35 +716,47 @@ class Bot(commands.Bot):
         """Affiche le score personnel de l'utilisateur"""
         user_name = ctx.author.name.lower()
         if os.path.exists(SCORES_FILE):
-            with open(SCORES_FILE, 'r', encoding='utf-8') as f:
-                scores = json.load(f)
-                user_score = scores.get(user_name, 0)
+            user_score = load_scores().get(user_name, 0)
             await ctx.send(f"📊 @{ctx.author.name}, tu as actuellement {user_score} points !")
         else:
             await ctx.send(f"📊 @{ctx.author.name}, tu n'as pas encore de points.")
 
 async def main():
-    if not load_grid('grille_exemple.json'):
-        print("📝 Aucune grille trouvée, génération d'une nouvelle grille...")
-        gen = GridGenerator(size=15)
-        gen.generate(nb_words=8, min_words=5)
-        load_grid('grille_exemple.json')
-        print("✅ Grille par défaut générée et chargée")
+    global recorder
+    load_state()
+    if RECORD_FILE:
+        recorder = ChatRecorder(RECORD_FILE)
+        recorder.record_grid(current_grid, channel=CHANNEL, answer_only=ANSWER_ONLY_MODE, chat_guesses=CHAT_GUESSES)
+        print(f"⏺️ Enregistrement du chat dans {RECORD_FILE}")
 
-    server = await websockets.serve(websocket_handler, "localhost", WS_PORT)
+    import websockets
+    compression = None if WS_COMPRESSION == 'none' else WS_COMPRESSION
+    server = await websockets.serve(websocket_handler, "localhost", WS_PORT, compression=compression, backlog=WS_BACKLOG)
+    http_runner = await start_http_server() if HTTP_PORT else None
     bot = Bot()
+    tasks = [server.wait_closed(), bot.start()]
+    if HINT_INTERVAL > 0:
+        tasks.append(hint_loop())
+    try:
+        # Arrêt demandé par un déploiement : même sortie propre qu'un Ctrl+C, état figé compris
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass
 
     try:
-        await asyncio.gather(
-            server.wait_closed(),
-            bot.start()
-        )
+        await asyncio.gather(*tasks)
     except asyncio.CancelledError:
         print("\nArrêt des tâches en cours...")
     finally:
+        word_stats.save()
+        save_snapshot()
+        if recorder:
+            recorder.close()
         await bot.close()
         server.close()
         await server.wait_closed()
+        if http_runner:
+            await http_runner.cleanup()
         print("👋 Bot et serveur arrêtés proprement.")
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+// Rendu de la grille sur un seul <canvas>, pour les grandes grilles (30x30 et plus).
+// Les cases sont adressées par leur indice à plat (y * size + x) de la table `cells`
+// envoyée par le serveur. Seules les cases modifiées sont repeintes, et toutes les
+// animations passent par une unique boucle requestAnimationFrame.
+
+const CELL_HIDDEN = 0;
+const CELL_REVEALED = 1;
+const CELL_SOLVED = 2;
+
+const COLORS = {
+    empty: '#111',
+    hidden: '#eee',
+    solved: '#9146FF',
+    border: '#444',
+    solvedBorder: '#a970ff',
+    number: '#444',
+    revealedLetter: '#9146FF',
+    solvedLetter: '#fff',
+    flash: '#ffd700',
+    hint: '#c9b3ff',
+};
+
+class CanvasGridRenderer {
+    constructor(canvas, { maxPixels = 600, maxCellSize = 40, staggerMs = 100, flashMs = 800 } = {}) {
+        this.canvas = canvas;
+        this.ctx = canvas.getContext('2d');
+        this.maxPixels = maxPixels;
+        this.maxCellSize = maxCellSize;
+        this.staggerMs = staggerMs;
+        this.flashMs = flashMs;
+        this.size = 0;
+        this.cellSize = maxCellSize;
+        this.state = new Uint8Array(0);
+        this.letters = [];
+        this.numbers = [];
+        this.occupied = new Uint8Array(0);
+        this.anims = new Map();
+        this.frameRequested = false;
+        this.onFrame = null;
+        this.tick = this.tick.bind(this);
+    }
+
+    setGrid(grid) {
+        this.size = grid.size;
+        this.cellSize = Math.max(8, Math.min(this.maxCellSize, Math.floor(this.maxPixels / this.size)));
+        const pixels = this.cellSize * this.size;
+        const ratio = window.devicePixelRatio || 1;
+        this.canvas.width = pixels * ratio;
+        this.canvas.height = pixels * ratio;
+        this.canvas.style.width = pixels + 'px';
+        this.canvas.style.height = pixels + 'px';
+        this.ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+
+        const total = this.size * this.size;
+        this.state = new Uint8Array(total);
+        this.occupied = new Uint8Array(total);
+        this.letters = new Array(total).fill('');
+        this.numbers = new Array(total).fill('');
+        this.anims.clear();
+
+        const solvedWords = new Set(grid.words.filter(w => w.solved).map(w => w.id));
+        grid.cells.forEach(c => {
+            this.occupied[c.i] = 1;
+            if (c.n) this.numbers[c.i] = c.n.join('/');
+            if (c.l) {
+                this.letters[c.i] = c.l;
+                this.state[c.i] = c.w.some(id => solvedWords.has(id)) ? CELL_SOLVED : CELL_REVEALED;
+            }
+        });
+        this.paintAll();
+    }
+
+    paintAll() {
+        const ctx = this.ctx;
+        ctx.fillStyle = COLORS.empty;
+        ctx.fillRect(0, 0, this.size * this.cellSize, this.size * this.cellSize);
+        for (let i = 0; i < this.occupied.length; i++) {
+            if (this.occupied[i]) this.paintCell(i, null, 0);
+        }
+    }
+
+    paintCell(index, flashColor, progress) {
+        const ctx = this.ctx;
+        const s = this.cellSize;
+        const x = (index % this.size) * s;
+        const y = Math.floor(index / this.size) * s;
+        const state = this.state[index];
+
+        ctx.fillStyle = COLORS.empty;
+        ctx.fillRect(x, y, s, s);
+
+        let fill = state === CELL_SOLVED ? COLORS.solved : COLORS.hidden;
+        if (flashColor) {
+            // Aller-retour vers la couleur de flash, comme l'animation CSS du mode DOM
+            const t = progress < 0.5 ? progress * 2 : (1 - progress) * 2;
+            fill = t > 0.5 ? flashColor : fill;
+        }
+        ctx.fillStyle = fill;
+        ctx.fillRect(x + 1, y + 1, s - 2, s - 2);
+        ctx.strokeStyle = state === CELL_SOLVED ? COLORS.solvedBorder : COLORS.border;
+        ctx.lineWidth = 1;
+        ctx.strokeRect(x + 1.5, y + 1.5, s - 3, s - 3);
+
+        if (this.numbers[index]) {
+            ctx.fillStyle = COLORS.number;
+            ctx.font = `bold ${Math.max(7, Math.round(s / 4))}px 'Segoe UI', sans-serif`;
+            ctx.textAlign = 'left';
+            ctx.textBaseline = 'top';
+            ctx.fillText(this.numbers[index], x + 3, y + 2);
+        }
+        if (state !== CELL_HIDDEN) {
+            ctx.fillStyle = state === CELL_SOLVED ? COLORS.solvedLetter : COLORS.revealedLetter;
+            ctx.font = `bold ${Math.round(s * 0.55)}px 'Segoe UI', sans-serif`;
+            ctx.textAlign = 'center';
+            ctx.textBaseline = 'middle';
+            ctx.fillText(this.letters[index], x + s / 2, y + s / 2 + 1);
+        }
+    }
+
+    solveCells(cells) {
+        const now = performance.now();
+        cells.forEach(([index, letter], k) => {
+            this.anims.set(index, { start: now + k * this.staggerMs, letter, target: CELL_SOLVED, color: COLORS.flash });
+        });
+        this.requestFrame();
+    }
+
+    revealCells(cells) {
+        const now = performance.now();
+        cells.forEach(([index, letter]) => {
+            if (this.state[index] === CELL_SOLVED || this.anims.has(index)) return;
+            this.anims.set(index, { start: now, letter, target: CELL_REVEALED, color: COLORS.hint });
+        });
+        this.requestFrame();
+    }
+
+    requestFrame() {
+        if (!this.frameRequested) {
+            this.frameRequested = true;
+            requestAnimationFrame(this.tick);
+        }
+    }
+
+    tick(now) {
+        this.frameRequested = false;
+        const started = performance.now();
+        for (const [index, anim] of this.anims) {
+            if (now < anim.start) continue;
+            if (this.state[index] !== anim.target) {
+                this.state[index] = anim.target;
+                this.letters[index] = anim.letter;
+            }
+            const progress = Math.min(1, (now - anim.start) / this.flashMs);
+            this.paintCell(index, progress < 1 ? anim.color : null, progress);
+            if (progress >= 1) this.anims.delete(index);
+        }
+        if (this.onFrame) this.onFrame(performance.now() - started);
+        if (this.anims.size > 0) this.requestFrame();
+    }
+}
@@ -0,0 +1,263 @@
+"""Enregistrement et rejeu du trafic du chat pour les tests de performance.
+
+Le bot écrit, si RECORD_FILE est défini, un journal JSONL en ajout seul :
+une ligne `grid` à chaque grille mise en jeu, puis une ligne par commande
+(`!mf`, `!classement`, `!score`, `!reset_grille`) ou proposition libre (`chat`,
+seulement quand CHAT_GUESSES est actif).
+
+Le rejeu pilote les vraies commandes de `Bot` hors ligne, dans un dossier
+temporaire, avec une horloge virtuelle calée sur le journal :
+
+    python replay.py live.jsonl --speed max --report run1.json
+    python replay.py live.jsonl --speed 10 --compare run1.json
+"""
+import argparse
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+RECORDED_COMMANDS = ('mf', 'classement', 'score', 'reset_grille')
+
+class ChatRecorder:
+    """Journal compact des commandes reçues, horodatées depuis le début de l'enregistrement"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.started = time.monotonic()
+        self.file = None
+
+    def elapsed(self):
+        return round(time.monotonic() - self.started, 3)
+
+    def write(self, entry):
+        if self.file is None:
+            self.file = open(self.filename, 'a', encoding='utf-8')
+        self.file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self.file.flush()
+
+    def record_grid(self, grid, **settings):
+        """Grille en jeu ; les réglages (chaîne, modes) accompagnent la première"""
+        self.write({"t": self.elapsed(), "grid": grid, **settings})
+
+    def record_message(self, user, content, chat_guesses=False):
+        """Enregistre une commande suivie ou, si le mode est actif, une proposition libre ; ignore le reste"""
+        if content.startswith('!'):
+            parts = content[1:].split()
+            if not parts or parts[0] not in RECORDED_COMMANDS:
+                return
+            cmd, args = parts[0], parts[1:]
+        elif chat_guesses:
+            cmd, args = 'chat', [content]
+        else:
+            return
+        self.write({"t": self.elapsed(), "cmd": cmd, "user": user, "args": args})
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def read_log(filename):
+    with open(filename, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+def latency_summary(samples):
+    values = sorted(samples)
+    return {
+        "n": len(values),
+        "p50": round(percentile(values, 0.50), 3),
+        "p95": round(percentile(values, 0.95), 3),
+        "p99": round(percentile(values, 0.99), 3),
+        "max": round(values[-1], 3) if values else 0.0,
+    }
+
+def digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+class ReplayAuthor:
+    def __init__(self, name):
+        self.name = name
+
+class ReplayContext:
+    """Contexte twitchio minimal : auteur, commande et messages envoyés au chat"""
+
+    def __init__(self, user, command, chat):
+        self.author = ReplayAuthor(user)
+        self.command = command
+        self.chat = chat
+
+    async def send(self, content):
+        self.chat.append(content)
+
+class RecordedGridGenerator:
+    """Remplace le générateur : !reset_grille remet en jeu la grille suivante du journal"""
+
+    grids = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def generate(self, *args, **kwargs):
+        if not self.grids:
+            return
+        with open('grille_exemple.json', 'w', encoding='utf-8') as f:
+            json.dump(self.grids.pop(0), f, ensure_ascii=False)
+
+def bot_commands():
+    from twitchio.ext import commands
+    import main
+    return {v.name: v for v in vars(main.Bot).values() if isinstance(v, commands.Command)}
+
+async def run_command(cmd, ctx, args):
+    """Appelle une commande comme le ferait twitchio, erreurs d'arguments comprises"""
+    from twitchio.ext import commands
+    import main
+    params = list(inspect.signature(cmd._callback).parameters.values())[2:]
+    try:
+        for param in params[len(args):]:
+            if param.default is inspect.Parameter.empty:
+                raise commands.MissingRequiredArgument(argname=param.name)
+        await cmd._callback(None, ctx, *args[:len(params)])
+    except (commands.MissingRequiredArgument, commands.BadArgument) as error:
+        await main.Bot.event_command_error(None, ctx, error)
+
+def state_digest(chat):
+    import main
+    grid = main.current_grid
+    return {
+        "grid": digest({"revealed": grid.get('revealed'),
+                        "solved": [w['id'] for w in grid.get('words', []) if w.get('solved', False)]}),
+        "scores": digest(main.load_scores()),
+        "leaderboard": digest(main.leaderboard.top_session(n=1000)),
+        "chat": digest(chat),
+    }
+
+async def replay(entries, speed=None):
+    """Rejoue un journal ; speed=None enchaîne sans attendre (vitesse max)"""
+    import main
+    from leaderboard import Leaderboard
+    from word_stats import WordStats
+
+    header = entries[0]
+    grids = [e["grid"] for e in entries[1:] if "grid" in e]
+    handlers = bot_commands()
+    # Les lignes `chat` ne sont des propositions que si le mode était actif à l'enregistrement
+    chat_guesses = header.get("chat_guesses", False)
+    events = [e for e in entries if e.get("cmd") in handlers or (e.get("cmd") == 'chat' and chat_guesses)]
+    saved = {name: getattr(main, name) for name in
+             ('clock', 'CHANNEL', 'ANSWER_ONLY_MODE', 'CHAT_GUESSES', 'GridGenerator', 'leaderboard',
+              'word_stats', 'recorder', 'connected_clients', 'current_grid', 'current_filename',
+              'SCORES_FILE')}
+    previous_dir = os.getcwd()
+    now = [header["t"]]
+    chat = []
+    latencies = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            random.seed(0)
+            main.clock = lambda: now[0]
+            main.CHANNEL = header.get("channel") or ''
+            main.ANSWER_ONLY_MODE = header.get("answer_only", False)
+            main.CHAT_GUESSES = chat_guesses
+            main.GridGenerator = RecordedGridGenerator
+            RecordedGridGenerator.grids = list(grids)
+            main.leaderboard = Leaderboard(os.path.join(tmp, 'solves'))
+            main.word_stats = WordStats(os.path.join(tmp, 'stats_mots.json'))
+            main.recorder = None
+            main.SCORES_FILE = os.path.join(tmp, 'scores.json')
+            main.connected_clients = set()
+            main.scores_cache["key"], main.scores_cache["scores"] = None, {}
+            main.leaderboard.load()
+            with open('grille_exemple.json', 'w', encoding='utf-8') as f:
+                json.dump(header["grid"], f, ensure_ascii=False)
+            main.load_grid('grille_exemple.json')
+
+            started = time.perf_counter()
+            for event in events:
+                if speed is not None:
+                    delay = (event["t"] - header["t"]) / speed - (time.perf_counter() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                now[0] = event["t"]
+                ctx = ReplayContext(event["user"], handlers.get(event["cmd"]), chat)
+                begin = time.perf_counter()
+                if event["cmd"] == 'chat':
+                    await main.chat_guess(ctx, event["user"], event["args"][0])
+                else:
+                    await run_command(ctx.command, ctx, event["args"])
+                latencies.setdefault(event["cmd"], []).append((time.perf_counter() - begin) * 1000)
+            duration = time.perf_counter() - started
+            state = state_digest(chat)
+        finally:
+            os.chdir(previous_dir)
+            for name, value in saved.items():
+                setattr(main, name, value)
+            main.scores_cache["key"], main.scores_cache["scores"] = None, {}
+            main.rebuild_answer_index()
+
+    every = [ms for samples in latencies.values() for ms in samples]
+    return {
+        "speed": "max" if speed is None else speed,
+        "events": len(events),
+        "duration": round(duration, 3),
+        "latency_ms": {"all": latency_summary(every),
+                       **{cmd: latency_summary(samples) for cmd, samples in sorted(latencies.items())}},
+        "digest": state,
+    }
+
+def compare_reports(before, after):
+    """Lignes de comparaison des latences et liste des parties de l'état qui divergent"""
+    lines = []
+    for cmd, stats in after["latency_ms"].items():
+        old = before["latency_ms"].get(cmd)
+        if old is None:
+            continue
+        lines.append(f"{cmd:>13} : " + "  ".join(
+            f"{p} {old[p]:.3f} → {stats[p]:.3f} ms" for p in ('p50', 'p95', 'p99')))
+    diverged = [key for key, value in after["digest"].items() if before["digest"].get(key) != value]
+    return lines, diverged
+
+def print_report(report):
+    print(f"{report['events']} événements rejoués en {report['duration']:.3f}s (vitesse {report['speed']})")
+    for cmd, stats in report["latency_ms"].items():
+        print(f"{cmd:>13} : n={stats['n']:<6} p50 {stats['p50']:.3f}  p95 {stats['p95']:.3f}  "
+              f"p99 {stats['p99']:.3f}  max {stats['max']:.3f} ms")
+    print("État : " + " ".join(f"{key}={value}" for key, value in report["digest"].items()))
+
+def parse_speed(value):
+    return None if value == 'max' else float(value)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="journal enregistré avec RECORD_FILE")
+    parser.add_argument("--speed", type=parse_speed, default=None, help="1, N ou max (défaut)")
+    parser.add_argument("--report", help="écrit le rapport JSON dans ce fichier")
+    parser.add_argument("--compare", help="rapport d'un rejeu précédent à comparer")
+    args = parser.parse_args()
+
+    report = asyncio.run(replay(read_log(args.log), args.speed))
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            lines, diverged = compare_reports(json.load(f), report)
+        print("\n".join(lines))
+        if diverged:
+            print(f"❌ Divergence d'état : {', '.join(diverged)}")
+            sys.exit(1)
+        print("✅ État identique au rejeu précédent")
@@ -7,7 +7,9 @@ from pathlib import Path
 from unittest.mock import patch
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
-from generator import GridGenerator
+import generator
+from generator import GridGenerator, FenwickSampler, word_cells, build_cell_table
+from word_stats import WordStats
 
 class TestGridGenerator(unittest.TestCase):
     def setUp(self):
@@ -211,6 +213,84 @@ class TestGridGenerator(unittest.TestCase):
         ids = [w['id'] for w in self.gen.placed_words]
         self.assertEqual(ids, [1, 2, 3])
 
+    def test_word_cells(self):
+        self.assertEqual(word_cells({"answer": "ABC", "x": 1, "y": 2, "direction": "horizontal"}, 10), [21, 22, 23])
+        self.assertEqual(word_cells({"answer": "ABC", "x": 1, "y": 2, "direction": "vertical"}, 10), [21, 31, 41])
+
+    def test_cell_table(self):
+        self.gen.place_word("PYTHON", "Langage", 0, 0, "horizontal", 1)
+        self.gen.place_word("THE", "Article", 2, 0, "vertical", 2)
+        cells = self.gen.cell_table()
+        occupied = sorted(y * 10 + x for y in range(10) for x in range(10) if self.gen.grid[y][x] != ' ')
+        self.assertEqual([c['i'] for c in cells], occupied)
+        self.assertEqual(cells[2], {"i": 2, "w": [1, 2], "n": [2]})
+        self.assertEqual(cells[0], {"i": 0, "w": [1], "n": [1]})
+        self.assertEqual(cells[1], {"i": 1, "w": [1]})
+        self.assertEqual(self.gen.placed_words[1]['cells'], [2, 12, 22])
+        self.assertFalse(any('l' in c for c in cells))
+
+    def test_generate_writes_cell_table(self):
+        with patch.object(self.gen, 'load_json_file', return_value=[["WORD", "Definition"]]):
+            self.gen.generate(nb_words=1)
+        with open('grille_exemple.json', 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data['size'], 10)
+        self.assertEqual([c['i'] for c in data['cells']], data['words'][0]['cells'])
+
+    def test_components_merge_on_intersection(self):
+        self.gen.place_word("PYTHON", "Langage", 0, 0, "horizontal", 1)
+        self.gen.place_word("CODE", "Instructions", 0, 5, "horizontal", 2)
+        self.assertEqual(self.gen.components, 2)
+        self.assertEqual(self.gen.merged_components("THE", 2, 0, "vertical"), 1)
+        self.gen.place_word("HTML", "Balisage", 3, 0, "vertical", 3)
+        self.assertEqual(self.gen.components, 2)
+        self.assertEqual(self.gen.merged_components("YAC", 1, 0, "vertical"), 1)
+        self.assertEqual(self.gen.merged_components("YESSIC", 1, 0, "vertical"), 2)
+        self.gen.place_word("YESSIC", "Pont", 1, 0, "vertical", 4)
+        self.assertEqual(self.gen.components, 1)
+        self.assertEqual(self.gen.find(1), self.gen.find(0))
+
+    def test_can_place_crossing_word(self):
+        self.gen.place_word("PYTHON", "Langage", 2, 5, "horizontal", 1)
+        self.assertTrue(self.gen.can_place("TOP", 4, 5, "vertical"))
+        self.assertFalse(self.gen.can_place("TOP", 4, 4, "vertical"))
+        self.assertFalse(self.gen.can_place("NO", 7, 5, "horizontal"))
+
+    def test_can_place_rejects_word_over_same_direction(self):
+        self.gen.place_word("BCD", "Suite", 2, 0, "horizontal", 1)
+        self.assertFalse(self.gen.can_place("ABCDE", 1, 0, "horizontal"))
+        self.gen.place_word("JEU", "Partie", 8, 2, "vertical", 2)
+        self.assertFalse(self.gen.can_place("JEUX", 8, 2, "vertical"))
+        self.assertTrue(self.gen.can_place("AJ", 7, 2, "horizontal"))
+
+    def test_reset_clears_components(self):
+        self.gen.place_word("PYTHON", "Langage", 0, 0, "horizontal", 1)
+        self.gen.reset()
+        self.assertEqual(self.gen.components, 0)
+        self.assertEqual(self.gen.parent, [])
+
+    def test_generate_retries_disconnected_grid(self):
+        test_words = [["ABC", "Un"], ["XYZ", "Deux"]]
+        with patch.object(self.gen, 'load_json_file', return_value=test_words), \
+             patch.object(self.gen, 'fill', wraps=self.gen.fill) as mock_fill, \
+             patch('builtins.print') as mock_print:
+            self.gen.generate(nb_words=2, min_words=1, max_retries=3)
+        self.assertEqual(mock_fill.call_count, 4)
+        messages = [c[0][0] for c in mock_print.call_args_list]
+        self.assertEqual(sum("nouvel essai" in m for m in messages), 3)
+        self.assertFalse(any("4/3" in m for m in messages))
+        self.assertTrue(any("grille conservée" in m for m in messages))
+        self.assertEqual(len(self.gen.placed_words), 2)
+        self.assertEqual(self.gen.components, 2)
+
+    def test_generate_connected_grid_no_retry(self):
+        test_words = [["PYTHON", "Langage"], ["TOP", "Sommet"]]
+        with patch.object(self.gen, 'load_json_file', return_value=test_words), \
+             patch.object(self.gen, 'fill', wraps=self.gen.fill) as mock_fill:
+            self.gen.generate(nb_words=2, min_words=1)
+        self.assertEqual(mock_fill.call_count, 1)
+        self.assertEqual(self.gen.components, 1)
+
     def test_performance_large_grid(self):
         """Test performance sur grande grille"""
         import time
@@ -229,5 +309,90 @@ class TestGridGenerator(unittest.TestCase):
         self.assertLess(duration, 5.0)
 
 
+
+class TestDifficultySelection(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bank_file = os.path.join(self.tmp.name, 'banque.json')
+        self.stats_file = os.path.join(self.tmp.name, 'stats.json')
+        bank = [["FACILE", "Simple"], ["DIFFICILE", "Dur"], ["INCONNU", "Jamais joué"]]
+        stats = {
+            "FACILE": {"shown": 10, "solved": 10, "wrong": 0, "times": [5, 6, 7]},
+            "DIFFICILE": {"shown": 10, "solved": 1, "wrong": 40, "times": [600]}
+        }
+        with open(self.bank_file, 'w', encoding='utf-8') as f:
+            json.dump(bank, f)
+        with open(self.stats_file, 'w', encoding='utf-8') as f:
+            json.dump(stats, f)
+        self.gen = GridGenerator(size=10, bank_file=self.bank_file, stats_file=self.stats_file)
+        generator._sampler_cache["key"] = None
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        for f in ['grille_exemple.json', 'historique.json']:
+            if os.path.exists(f):
+                os.remove(f)
+
+    def test_fenwick_sampler_distribution(self):
+        sampler = FenwickSampler(["A", "B", "C", "D", "E"], [1, 0, 3, 0, 4])
+        draws = [sampler.sample() for _ in range(4000)]
+        self.assertNotIn("B", draws)
+        self.assertNotIn("D", draws)
+        self.assertAlmostEqual(draws.count("E") / len(draws), 0.5, delta=0.05)
+
+    def test_fenwick_sampler_update(self):
+        sampler = FenwickSampler(["A", "B", "C"], [1, 1, 1])
+        sampler.update(0, 0)
+        sampler.update(2, 0)
+        self.assertEqual({sampler.sample() for _ in range(200)}, {"B"})
+        self.assertEqual(sampler.total, 1)
+
+    def test_fenwick_sampler_empty(self):
+        self.assertEqual(len(FenwickSampler([], [])), 0)
+
+    def test_sampler_targets_difficulty(self):
+        easy = self.gen.difficulty_sampler(0.0)
+        draws = [easy.sample()[0] for _ in range(500)]
+        self.assertGreater(draws.count("FACILE"), draws.count("DIFFICILE"))
+        hard = self.gen.difficulty_sampler(1.0)
+        draws = [hard.sample()[0] for _ in range(500)]
+        self.assertGreater(draws.count("DIFFICILE"), draws.count("FACILE"))
+
+    def test_sampler_reweights_played_words_in_place(self):
+        stats = WordStats(self.stats_file).load()
+        gen = GridGenerator(size=10, bank_file=self.bank_file, stats_file=self.stats_file, stats=stats)
+        first = gen.difficulty_sampler(0.0)
+        easy_weight = first.weights[0]
+        for _ in range(30):
+            stats.record_shown("FACILE")
+            stats.record_wrong("FACILE")
+        stats.save()
+        with patch.object(GridGenerator, 'load_json_file', side_effect=AssertionError("banque relue")):
+            again = GridGenerator(size=10, bank_file=self.bank_file, stats_file=self.stats_file,
+                                  stats=stats).difficulty_sampler(0.0)
+        self.assertIs(again, first)
+        self.assertLess(again.weights[0], easy_weight)
+        self.assertAlmostEqual(again.total, sum(again.weights))
+
+    def test_sampler_rebuilt_when_stats_reloaded(self):
+        stats = WordStats(self.stats_file).load()
+        gen = GridGenerator(size=10, bank_file=self.bank_file, stats_file=self.stats_file, stats=stats)
+        first = gen.difficulty_sampler(0.5)
+        self.assertIs(gen.difficulty_sampler(0.5), first)
+        stats.load()
+        self.assertIsNot(gen.difficulty_sampler(0.5), first)
+
+    def test_sample_words_skips_history(self):
+        words = self.gen.sample_words(0.5, 3, ["FACILE"])
+        self.assertNotIn("FACILE", [w[0] for w in words])
+        self.assertEqual(len(words), len({w[0] for w in words}))
+
+    def test_generate_with_difficulty(self):
+        real_load = self.gen.load_json_file
+        with patch.object(self.gen, 'load_json_file',
+                          side_effect=lambda f, d: [] if f == "historique.json" else real_load(f, d)):
+            self.gen.generate(nb_words=2, min_words=1, difficulty=0.9)
+        self.assertGreaterEqual(len(self.gen.placed_words), 1)
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,91 @@
+import unittest
+import os
+import json
+import tempfile
+import sys
+from pathlib import Path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+from leaderboard import Leaderboard
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.board = Leaderboard(self.tmp.name, segment_size=3, window=100, session="s1")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_appends_to_log(self):
+        self.board.record("Alice", "g1", 4, 10, ts=1000)
+        with open(self.board.segment_path(1), 'r', encoding='utf-8') as f:
+            entry = json.loads(f.readline())
+        self.assertEqual(entry, {"user": "alice", "grid": "g1", "word": 4, "ts": 1000,
+                                 "pts": 10, "session": "s1"})
+
+    def test_top_grid_and_session(self):
+        self.board.record("Alice", "g1", 1, 10, ts=1000)
+        self.board.record("Bob", "g1", 2, 15, ts=1001)
+        self.board.record("Alice", "g2", 1, 10, ts=1002)
+        self.assertEqual(self.board.top_grid("g1"), [("bob", 15), ("alice", 10)])
+        self.assertEqual(self.board.top_grid("g2"), [("alice", 10)])
+        self.assertEqual(self.board.top_session(), [("alice", 20), ("bob", 15)])
+        self.assertEqual(self.board.top_session(session="autre"), [])
+
+    def test_sliding_window(self):
+        self.board.record("Alice", "g1", 1, 10, ts=1000)
+        self.board.record("Bob", "g1", 2, 10, ts=1050)
+        self.assertEqual(self.board.top_window(now=1060), [("alice", 10), ("bob", 10)])
+        self.assertEqual(self.board.top_window(now=1120), [("bob", 10)])
+        self.assertEqual(self.board.top_window(now=1200), [])
+
+    def test_rotation_compacts_closed_segments(self):
+        for i in range(4):
+            self.board.record("Alice", "g1", i, 10, ts=1000 + i)
+        self.assertFalse(os.path.exists(self.board.segment_path(1)))
+        self.assertTrue(os.path.exists(self.board.segment_path(2)))
+        with open(self.board.snapshot_path(), 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot['last_segment'], 1)
+        self.assertEqual(snapshot['grids'], {"g1": {"alice": 30}})
+
+    def test_load_restores_aggregates(self):
+        for i in range(5):
+            self.board.record("Alice" if i % 2 else "Bob", "g1", i, 10, ts=1000 + i)
+        reloaded = Leaderboard(self.tmp.name, segment_size=3, window=10 ** 10, session="s2")
+        reloaded.load()
+        self.assertEqual(reloaded.top_grid("g1"), [("bob", 30), ("alice", 20)])
+        self.assertEqual(reloaded.top_session(session="s1"), [("bob", 30), ("alice", 20)])
+        self.assertEqual(reloaded.segment, 2)
+        self.assertEqual(reloaded.segment_lines, 2)
+
+    def test_state_round_trip(self):
+        for i in range(4):
+            self.board.record("Alice" if i % 2 else "Bob", "g1", i, 10, ts=1000 + i)
+        state = json.loads(json.dumps(self.board.state()))
+        restored = Leaderboard(self.tmp.name, segment_size=3, window=100, session="s2")
+        restored.restore(state)
+        self.assertEqual(restored.session, "s1")
+        self.assertEqual(restored.top_grid("g1"), self.board.top_grid("g1"))
+        self.assertEqual(restored.top_window(now=1010), self.board.top_window(now=1010))
+        self.assertEqual((restored.segment, restored.segment_lines), (2, 1))
+
+    def test_load_compacts_leftover_segments(self):
+        with open(os.path.join(self.tmp.name, "segment-000001.jsonl"), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"user": "bob", "grid": "g1", "word": 1, "ts": 1, "pts": 10, "session": "s0"}) + "\n")
+        with open(os.path.join(self.tmp.name, "segment-000002.jsonl"), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"user": "bob", "grid": "g1", "word": 2, "ts": 2, "pts": 10, "session": "s0"}) + "\n")
+        self.board.load()
+        self.assertFalse(os.path.exists(self.board.segment_path(1)))
+        self.assertEqual(self.board.top_grid("g1"), [("bob", 20)])
+        self.board.load()
+        self.assertEqual(self.board.top_grid("g1"), [("bob", 20)])
+
+    def test_load_empty_directory(self):
+        self.board.load()
+        self.assertEqual(self.board.top_session(), [])
+        self.assertEqual(self.board.segment, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
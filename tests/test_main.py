@@ -3,6 +3,7 @@ import os
 import json
 import asyncio
 import sys
+import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, patch, MagicMock
 parent_dir = Path(__file__).parent.parent
@@ -20,6 +21,29 @@ class MockContext:
         self.prefix = '!'
         self.command = None
 
+class GameTestCase(unittest.TestCase):
+    """État de jeu isolé : classement, statistiques et scores dans un dossier temporaire.
+
+    Les globales de `main` remplacées via `set_globals` sont restaurées après chaque test.
+    """
+
+    def setUp(self):
+        self.ctx = MockContext()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.set_globals(
+            SCORES_FILE=os.path.join(self.tmp.name, 'scores.json'),
+            leaderboard=main.Leaderboard(os.path.join(self.tmp.name, 'solves')),
+            word_stats=main.WordStats(os.path.join(self.tmp.name, 'stats.json')),
+            connected_clients=set(),
+        )
+
+    def set_globals(self, **values):
+        patcher = patch.multiple(main, **values)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
 class TestMainFunctions(unittest.TestCase):
     def setUp(self):
         main.current_grid = {}
@@ -48,7 +72,10 @@ class TestMainFunctions(unittest.TestCase):
             json.dump(test_grid, f)
         result = main.load_grid('test_grid.json')
         self.assertTrue(result)
-        self.assertEqual(main.current_grid, test_grid)
+        for key, value in test_grid['words'][0].items():
+            self.assertEqual(main.current_grid['words'][0][key], value)
+        self.assertEqual(main.current_grid['words'][0]['cells'], [60, 61, 62, 63, 64, 65])
+        self.assertEqual(main.current_grid['cells'][0], {"i": 60, "w": [1], "n": [1]})
         self.assertEqual(main.current_filename, 'test_grid.json')
 
     def test_load_grid_missing_file(self):
@@ -145,7 +172,7 @@ class TestMainFunctions(unittest.TestCase):
             await main.broadcast_update(test_data)
             mock_client.send.assert_called_once()
             sent_data = json.loads(mock_client.send.call_args[0][0])
-            self.assertEqual(sent_data, test_data)
+            self.assertEqual(sent_data, {**test_data, "seq": main.broadcast_seq})
         asyncio.run(test())
 
 
@@ -332,6 +359,573 @@ class TestBotCommands(unittest.TestCase):
         asyncio.run(test())
 
 
+class TestAnswerIndex(GameTestCase):
+    """Tests du mode réponse seule"""
+
+    def setUp(self):
+        super().setUp()
+        self.set_globals(ANSWER_ONLY_MODE=main.ANSWER_ONLY_MODE)
+        main.current_grid = {
+            "words": [
+                {"id": 1, "answer": "PYTHON", "clue": "Langage", "x": 0, "y": 0,
+                 "direction": "horizontal", "solved": False},
+                {"id": 2, "answer": "JAVA", "clue": "Autre langage", "x": 0, "y": 2,
+                 "direction": "horizontal", "solved": True}
+            ]
+        }
+        main.rebuild_answer_index()
+
+    def test_normalize_answer(self):
+        self.assertEqual(main.normalize_answer("  python "), "PYTHON")
+        self.assertEqual(main.normalize_answer("Éléphant"), "ELEPHANT")
+        self.assertEqual(main.normalize_answer("web-socket"), "WEBSOCKET")
+
+    def test_index_contains_only_unsolved(self):
+        self.assertIn("PYTHON", main.answer_index)
+        self.assertNotIn("JAVA", main.answer_index)
+
+    def test_find_unsolved_word(self):
+        self.assertIs(main.find_unsolved_word("python"), main.current_grid['words'][0])
+        self.assertIsNone(main.find_unsolved_word("java"))
+        self.assertIsNone(main.find_unsolved_word("x" * (main.MAX_GUESS_LENGTH + 1)))
+
+    def test_mf_answer_only(self):
+        main.ANSWER_ONLY_MODE = True
+        with patch('main.save_grid'), patch('main.broadcast_update') as mock_broadcast:
+            asyncio.run(main.Bot.mot_fleche._callback(None, self.ctx, "Python"))
+        self.assertTrue(main.current_grid['words'][0]['solved'])
+        self.assertNotIn("PYTHON", main.answer_index)
+        sent = mock_broadcast.call_args_list[0][0][0]
+        self.assertEqual(sent['word_id'], 1)
+
+    def test_mf_answer_only_disabled(self):
+        main.ANSWER_ONLY_MODE = False
+        with self.assertRaises(main.commands.MissingRequiredArgument):
+            asyncio.run(main.Bot.mot_fleche._callback(None, self.ctx, "PYTHON"))
+        self.assertFalse(main.current_grid['words'][0]['solved'])
+
+    def test_mf_with_number_updates_index(self):
+        with patch('main.save_grid'), patch('main.broadcast_update'):
+            asyncio.run(main.Bot.mot_fleche._callback(None, self.ctx, "1", "python"))
+        self.assertTrue(main.current_grid['words'][0]['solved'])
+        self.assertEqual(main.answer_index, {})
+
+    def test_mf_number_with_leading_zero(self):
+        with patch('main.save_grid'), patch('main.broadcast_update'):
+            asyncio.run(main.Bot.mot_fleche._callback(None, self.ctx, "01", "python"))
+        self.assertTrue(main.current_grid['words'][0]['solved'])
+
+    def test_mf_bad_number(self):
+        with self.assertRaises(main.commands.BadArgument):
+            asyncio.run(main.Bot.mot_fleche._callback(None, self.ctx, "un", "PYTHON"))
+
+
+class TestChatGuesses(GameTestCase):
+    """Tests des propositions libres dans le chat (CHAT_GUESSES)"""
+
+    def setUp(self):
+        super().setUp()
+        self.set_globals(CHAT_GUESSES=True, recorder=None)
+        main.current_grid = {
+            "words": [
+                {"id": 1, "answer": "PYTHON", "clue": "Langage", "x": 0, "y": 0,
+                 "direction": "horizontal", "solved": False}
+            ]
+        }
+        main.rebuild_answer_index()
+        self.bot = MagicMock()
+        self.bot.handle_commands = AsyncMock()
+
+    def send(self, content):
+        message = MagicMock()
+        message.echo = False
+        message.content = content
+        message.author.name = "Alice"
+        message.channel.send = AsyncMock()
+        with patch('main.save_grid'), patch('main.broadcast_update'):
+            asyncio.run(main.Bot.event_message(self.bot, message))
+        return message
+
+    def test_correct_answer_solves_word(self):
+        message = self.send("Python")
+        self.assertTrue(main.current_grid['words'][0]['solved'])
+        self.assertIn("@Alice", message.channel.send.call_args_list[0][0][0])
+        self.bot.handle_commands.assert_not_called()
+
+    def test_wrong_answer_stays_silent(self):
+        message = self.send("java")
+        self.assertFalse(main.current_grid['words'][0]['solved'])
+        message.channel.send.assert_not_called()
+        self.bot.handle_commands.assert_not_called()
+
+    def test_command_still_handled(self):
+        message = self.send("!mf python")
+        self.assertFalse(main.current_grid['words'][0]['solved'])
+        self.bot.handle_commands.assert_awaited_once_with(message)
+
+    def test_long_message_ignored(self):
+        message = self.send("python" + " " * main.MAX_GUESS_LENGTH)
+        self.assertFalse(main.current_grid['words'][0]['solved'])
+        message.channel.send.assert_not_called()
+
+    def test_disabled_mode_goes_to_commands(self):
+        main.CHAT_GUESSES = False
+        message = self.send("python")
+        self.assertFalse(main.current_grid['words'][0]['solved'])
+        self.bot.handle_commands.assert_awaited_once_with(message)
+
+
+class TestHints(GameTestCase):
+    """Tests des indices lettre par lettre"""
+
+    def setUp(self):
+        super().setUp()
+        # PYTHO horizontal et THE vertical se croisent sur le T (case 2)
+        main.current_grid = {
+            "size": 5,
+            "words": [
+                {"id": 1, "answer": "PYTHO", "clue": "Langage", "x": 0, "y": 0,
+                 "direction": "horizontal", "solved": False},
+                {"id": 2, "answer": "THE", "clue": "Article", "x": 2, "y": 0,
+                 "direction": "vertical", "solved": False}
+            ]
+        }
+        main.rebuild_answer_index()
+
+    def test_grid_size_fallback(self):
+        self.assertEqual(main.grid_size({"words": [
+            {"answer": "ABC", "x": 1, "y": 0, "direction": "horizontal"},
+            {"answer": "ABCDE", "x": 0, "y": 2, "direction": "vertical"}
+        ]}), 7)
+
+    def test_solved_word_letters_in_cell_table(self):
+        main.current_grid['words'][1]['solved'] = True
+        main.prepare_grid_state()
+        self.assertEqual(main.cell_index[2], {"i": 2, "w": [1, 2], "n": [2], "l": "T"})
+        self.assertEqual(main.cell_index[12].get('l'), "E")
+        self.assertNotIn('l', main.cell_index[0])
+
+    def test_shared_cell_counts_for_both_words(self):
+        main.prepare_grid_state()
+        main.reveal_cells([2])
+        self.assertEqual(main.word_progress(main.current_grid['words'][0]), (1, 5))
+        self.assertEqual(main.word_progress(main.current_grid['words'][1]), (1, 3))
+
+    def test_word_solved_carries_cells(self):
+        main.prepare_grid_state()
+        with patch('main.save_grid'), patch('main.broadcast_update') as mock_broadcast:
+            asyncio.run(main.solve_word(self.ctx, "TestUser", main.current_grid['words'][1]))
+        sent = mock_broadcast.call_args_list[0][0][0]
+        self.assertEqual(sent['cells'], [[2, "T"], [7, "H"], [12, "E"]])
+
+    def test_give_hint_sends_single_cell(self):
+        with patch('main.save_grid'), patch('main.broadcast_update') as mock_broadcast:
+            word, index, letter = asyncio.run(main.give_hint(2))
+        self.assertEqual(word['id'], 2)
+        self.assertEqual(main.current_grid['revealed'][index], '1')
+        mock_broadcast.assert_called_once_with({"type": "CELL_REVEALED", "cells": [[index, letter]]})
+
+    def test_hint_keeps_last_letter_hidden(self):
+        with patch('main.save_grid'), patch('main.broadcast_update'):
+            self.assertIsNotNone(asyncio.run(main.give_hint(2)))
+            self.assertIsNotNone(asyncio.run(main.give_hint(2)))
+            self.assertIsNone(asyncio.run(main.give_hint(2)))
+        self.assertEqual(main.word_progress(main.current_grid['words'][1]), (2, 3))
+
+    def test_hint_loop_waits_for_stagnation(self):
+        now = [0.0]
+        hints = []
+        # Réveils successifs de la boucle ; à 45 s un joueur résout THE juste avant le réveil
+        wakeups = iter([20.0, 30.0, 45.0, 70.0, 75.0])
+
+        async def fake_sleep(delay):
+            self.assertEqual(delay, 30)
+            try:
+                now[0] = next(wakeups)
+            except StopIteration:
+                raise asyncio.CancelledError
+            if now[0] == 45.0:
+                await main.solve_word(self.ctx, "TestUser", main.current_grid['words'][1])
+                self.assertEqual(main.last_progress, 45.0)
+
+        async def record(data):
+            if data["type"] == "CELL_REVEALED":
+                hints.append(now[0])
+
+        self.set_globals(clock=lambda: now[0], HINT_INTERVAL=30, last_progress=0.0)
+        with patch('main.save_grid'), patch('main.broadcast_update', side_effect=record), \
+             patch('main.asyncio.sleep', side_effect=fake_sleep):
+            with self.assertRaises(asyncio.CancelledError):
+                asyncio.run(main.hint_loop())
+        self.assertEqual(hints, [30.0, 75.0])
+
+    def test_solve_reveals_cells(self):
+        main.prepare_grid_state()
+        with patch('main.save_grid'), patch('main.broadcast_update'):
+            asyncio.run(main.solve_word(self.ctx, "TestUser", main.current_grid['words'][0]))
+        self.assertEqual(main.word_progress(main.current_grid['words'][1]), (1, 3))
+
+
+class TestClassement(GameTestCase):
+    """Tests des classements par grille, session et semaine"""
+
+    def setUp(self):
+        super().setUp()
+        main.current_grid = {"grid_id": "g1", "words": []}
+
+    def test_classement_grille(self):
+        main.leaderboard.record("Alice", "g1", 1, 10)
+        main.leaderboard.record("Bob", "g1", 2, 10)
+        main.leaderboard.record("Bob", "g1", 3, 10)
+        main.leaderboard.record("Alice", "g0", 1, 50)
+        asyncio.run(main.Bot.classement._callback(None, self.ctx, "grille"))
+        self.ctx.send.assert_called_once_with("🏆 TOP 5 DE LA GRILLE : 1. bob (20pts) | 2. alice (10pts)")
+
+    def test_classement_semaine_empty(self):
+        asyncio.run(main.Bot.classement._callback(None, self.ctx, "semaine"))
+        self.ctx.send.assert_called_once_with("📊 Aucun score enregistré pour le moment.")
+
+
+class TestSpeedScoring(GameTestCase):
+    """Tests du barème dégressif, du bonus de premier mot et des séries"""
+
+    def setUp(self):
+        super().setUp()
+        main.current_grid = {"words": [
+            {"id": i, "answer": answer, "clue": "", "x": 0, "y": i,
+             "direction": "horizontal", "solved": False}
+            for i, answer in enumerate(["UN", "DEUX", "TROIS", "QUATRE"], 1)
+        ]}
+        self.now = 1000.0
+        self.set_globals(clock=lambda: self.now)
+        main.rebuild_answer_index()
+        main.start_word_timers()
+
+    def solve(self, user, index):
+        with patch('main.save_grid'), patch('main.broadcast_update'):
+            asyncio.run(main.solve_word(self.ctx, user, main.current_grid['words'][index]))
+
+    def test_compute_points_decay(self):
+        self.assertEqual(main.compute_points(0), main.BASE_POINTS)
+        half = main.MIN_POINTS + (main.BASE_POINTS - main.MIN_POINTS) / 2
+        self.assertEqual(main.compute_points(main.POINTS_HALF_LIFE), round(half))
+        self.assertEqual(main.compute_points(10 ** 6), main.MIN_POINTS)
+
+    def test_compute_points_bonuses(self):
+        self.assertEqual(main.compute_points(0, first=True), main.BASE_POINTS + main.FIRST_SOLVE_BONUS)
+        self.assertEqual(main.compute_points(0, streak_count=3), round(main.BASE_POINTS * 1.5))
+        self.assertEqual(main.compute_points(0, streak_count=50), round(main.BASE_POINTS * main.STREAK_MAX))
+
+    def test_first_solver_and_streak(self):
+        self.solve("Alice", 0)
+        self.assertEqual(main.load_scores()['alice'], main.BASE_POINTS + main.FIRST_SOLVE_BONUS)
+        self.solve("Alice", 1)
+        self.assertEqual(main.streak, {"user": "alice", "count": 2})
+        self.solve("Bob", 2)
+        self.assertEqual(main.streak, {"user": "bob", "count": 1})
+        self.assertEqual(main.load_scores()['bob'], main.BASE_POINTS)
+
+    def test_elapsed_time_feeds_stats(self):
+        self.now += main.POINTS_HALF_LIFE * 20
+        self.solve("Alice", 3)
+        self.assertEqual(main.word_stats.median_time("QUATRE"), main.POINTS_HALF_LIFE * 20)
+        self.assertEqual(main.leaderboard.top_session(), [("alice", main.MIN_POINTS + main.FIRST_SOLVE_BONUS)])
+
+    def test_scores_not_reread_when_unchanged(self):
+        self.solve("Alice", 0)
+        with patch('builtins.open', side_effect=AssertionError("lecture inattendue")):
+            self.assertIn('alice', main.load_scores())
+
+
+class TestInitCache(unittest.TestCase):
+    """Tests du message INIT pré-sérialisé"""
+
+    def setUp(self):
+        main.current_grid = {"words": [{"id": 1, "answer": "PYTHON", "solved": False}]}
+        main.connected_clients = set()
+
+    def test_payload_cached_per_version(self):
+        first = main.init_payload()
+        self.assertEqual(json.loads(first), {"type": "INIT", "grid": {"words": [{"id": 1, "solved": False}]}})
+        with patch('main.json.dumps') as mock_dumps:
+            self.assertIs(main.init_payload(), first)
+            mock_dumps.assert_not_called()
+
+    def test_payload_invalidated_on_change(self):
+        first = main.init_payload()
+        main.current_grid['words'][0]['solved'] = True
+        main.grid_changed()
+        self.assertTrue(json.loads(main.init_payload())['grid']['words'][0]['solved'])
+        self.assertIsNot(main.init_payload(), first)
+
+    def test_payload_hides_answers(self):
+        main.current_grid = {"size": 8, "words": [
+            {"id": 1, "answer": "PYTHON", "clue": "Langage", "x": 0, "y": 0, "direction": "horizontal", "solved": False}]}
+        main.prepare_grid_state()
+        main.reveal_cells([1])
+        main.grid_changed()
+        grid = json.loads(main.init_payload())['grid']
+        self.assertNotIn('answer', grid['words'][0])
+        self.assertNotIn('PYTHON', main.init_payload())
+        self.assertEqual([c.get('l') for c in grid['cells'][:2]], [None, 'Y'])
+        self.assertEqual(main.current_grid['words'][0]['answer'], "PYTHON")
+
+    def test_payload_follows_new_grid_object(self):
+        main.init_payload()
+        main.current_grid = {"words": []}
+        self.assertEqual(json.loads(main.init_payload())['grid'], {"words": []})
+
+    def test_websocket_handler_sends_cached_init(self):
+        class FakeSocket:
+            def __init__(self):
+                self.send = AsyncMock()
+            def __aiter__(self):
+                return self
+            async def __anext__(self):
+                raise StopAsyncIteration
+
+        sockets = [FakeSocket() for _ in range(3)]
+        async def test():
+            for ws in sockets:
+                await main.websocket_handler(ws)
+        asyncio.run(test())
+        payloads = [ws.send.call_args[0][0] for ws in sockets]
+        self.assertTrue(all(p is payloads[0] for p in payloads))
+        self.assertEqual(main.connected_clients, set())
+
+
+class TestSnapshot(GameTestCase):
+    """Tests de la reprise à chaud"""
+
+    def setUp(self):
+        super().setUp()
+        self.snapshot = os.path.join(self.tmp.name, 'reprise.json')
+        self.grid_file = os.path.join(self.tmp.name, 'grille.json')
+        with open(self.grid_file, 'w', encoding='utf-8') as f:
+            json.dump({"grid_id": "g1", "words": [
+                {"id": 1, "answer": "PYTHON", "clue": "Langage", "x": 0, "y": 0, "direction": "horizontal", "solved": False},
+                {"id": 2, "answer": "CODE", "clue": "Programme", "x": 0, "y": 2, "direction": "horizontal", "solved": False},
+            ]}, f)
+        self.now = 1000.0
+        self.set_globals(clock=lambda: self.now)
+        main.load_grid(self.grid_file)
+
+    def forget_state(self):
+        main.current_grid = {}
+        main.answer_index.clear()
+        main.cell_index.clear()
+        main.word_available_at.clear()
+        main.leaderboard = main.Leaderboard(os.path.join(self.tmp.name, 'solves'))
+        main.broadcast_seq = 0
+
+    def test_round_trip(self):
+        with patch('main.broadcast_message'):
+            asyncio.run(main.solve_word(self.ctx, "Alice", main.current_grid['words'][0]))
+        seq = main.broadcast_seq
+        self.assertTrue(main.save_snapshot(self.snapshot))
+        self.forget_state()
+
+        self.assertTrue(main.restore_snapshot(self.snapshot))
+        self.assertFalse(os.path.exists(self.snapshot))
+        self.assertTrue(main.current_grid['words'][0]['solved'])
+        self.assertIs(main.answer_index['CODE'], main.current_grid['words'][1])
+        self.assertEqual(main.leaderboard.top_grid("g1"), [("alice", main.BASE_POINTS + main.FIRST_SOLVE_BONUS)])
+        self.assertEqual(main.broadcast_seq, seq)
+        self.assertEqual(main.cell_index[0]['l'], 'P')
+
+    def test_restore_does_not_rebuild(self):
+        main.init_payload()
+        main.save_snapshot(self.snapshot)
+        self.forget_state()
+        leaderboard, word_stats = main.leaderboard, main.word_stats
+        with patch('main.rebuild_answer_index', side_effect=AssertionError), \
+             patch('main.prepare_grid_state', side_effect=AssertionError), \
+             patch('main.Leaderboard.load', side_effect=AssertionError):
+            self.assertTrue(main.restore_snapshot(self.snapshot))
+            self.assertIn('"Langage"', main.init_payload())
+        self.assertIs(main.leaderboard, leaderboard)
+        self.assertIs(main.word_stats, word_stats)
+
+    def test_snapshot_is_plain_json(self):
+        with patch('main.broadcast_message'):
+            asyncio.run(main.solve_word(self.ctx, "Alice", main.current_grid['words'][0]))
+        main.save_snapshot(self.snapshot)
+        with open(self.snapshot, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.assertEqual(state["version"], main.SNAPSHOT_VERSION)
+        self.assertEqual(state["leaderboard"]["grids"], {"g1": {"alice": main.BASE_POINTS + main.FIRST_SOLVE_BONUS}})
+
+    def test_other_version_ignored(self):
+        main.save_snapshot(self.snapshot)
+        with open(self.snapshot, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        state["version"] = main.SNAPSHOT_VERSION - 1
+        with open(self.snapshot, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        self.assertFalse(main.restore_snapshot(self.snapshot))
+
+    def test_word_timers_skip_downtime(self):
+        self.now = 1030.0
+        main.save_snapshot(self.snapshot)
+        self.now = 5000.0
+        main.restore_snapshot(self.snapshot)
+        self.assertEqual(main.word_available_at[2], 4970.0)
+
+    def test_stale_snapshot_ignored(self):
+        main.save_snapshot(self.snapshot)
+        with open(self.grid_file, 'w', encoding='utf-8') as f:
+            json.dump({"words": []}, f)
+        self.assertFalse(main.restore_snapshot(self.snapshot))
+        self.assertFalse(os.path.exists(self.snapshot))
+
+    def test_malformed_snapshot_ignored(self):
+        for content in ({"version": main.SNAPSHOT_VERSION}, [1, 2], "texte"):
+            with open(self.snapshot, 'w', encoding='utf-8') as f:
+                json.dump(content, f)
+            self.assertFalse(main.restore_snapshot(self.snapshot))
+            self.assertFalse(os.path.exists(self.snapshot))
+
+    def test_missing_snapshot(self):
+        self.assertFalse(main.restore_snapshot(self.snapshot))
+
+
+class TestHttpApi(GameTestCase):
+    """Tests de la lecture HTTP/SSE"""
+
+    def setUp(self):
+        super().setUp()
+        main.sse_clients.clear()
+        main.event_log.clear()
+        main.http_cache.clear()
+        main.current_filename = os.path.join(self.tmp.name, 'grille.json')
+        main.current_grid = {"grid_id": "g1", "words": [
+            {"id": 1, "answer": "PYTHON", "clue": "Langage", "x": 0, "y": 0, "direction": "horizontal", "solved": False},
+            {"id": 2, "answer": "CODE", "clue": "Programme", "x": 0, "y": 2, "direction": "horizontal", "solved": False},
+        ]}
+        main.prepare_grid_state()
+        main.rebuild_answer_index()
+        main.start_word_timers()
+        main.grid_changed()
+
+    def run_client(self, scenario):
+        from aiohttp.test_utils import TestClient, TestServer
+        async def run():
+            async with TestClient(TestServer(main.create_http_app())) as client:
+                await scenario(client)
+        asyncio.run(run())
+
+    async def solve(self, user, index):
+        await main.solve_word(self.ctx, user, main.current_grid['words'][index])
+
+    def test_grille_etag_and_304(self):
+        async def scenario(client):
+            first = await client.get('/grille')
+            self.assertEqual(first.status, 200)
+            self.assertEqual(json.loads(await first.text())['grid']['grid_id'], "g1")
+            self.assertNotIn("PYTHON", await first.text())
+            etag = first.headers['ETag']
+            unchanged = await client.get('/grille', headers={'If-None-Match': etag})
+            self.assertEqual(unchanged.status, 304)
+            await self.solve("Alice", 0)
+            changed = await client.get('/grille', headers={'If-None-Match': etag})
+            self.assertEqual(changed.status, 200)
+            self.assertNotEqual(changed.headers['ETag'], etag)
+        self.run_client(scenario)
+
+    def test_hot_path_reuses_serialized_bodies(self):
+        async def scenario(client):
+            await client.get('/grille')
+            await client.get('/classement')
+            with patch('main.json.dumps', side_effect=AssertionError), \
+                 patch('main.load_scores', side_effect=AssertionError):
+                self.assertEqual((await client.get('/grille')).status, 200)
+                self.assertEqual((await client.get('/classement')).status, 200)
+        self.run_client(scenario)
+
+    def test_classement_periods(self):
+        async def scenario(client):
+            empty = await client.get('/classement', params={'periode': 'session'})
+            self.assertEqual(json.loads(await empty.text()), {"periode": "session", "classement": []})
+            await self.solve("Alice", 0)
+            for period in ('total', 'grille', 'session', 'semaine'):
+                resp = await client.get('/classement', params={'periode': period})
+                self.assertEqual(json.loads(await resp.text())['classement'][0][0], "alice")
+                again = await client.get('/classement', params={'periode': period},
+                                         headers={'If-None-Match': resp.headers['ETag']})
+                self.assertEqual(again.status, 304)
+            bad = await client.get('/classement', params={'periode': 'annee'})
+            self.assertEqual(bad.status, 400)
+        self.run_client(scenario)
+
+    async def read_event(self, resp):
+        fields = {}
+        while True:
+            line = (await asyncio.wait_for(resp.content.readline(), 2)).decode('utf-8').rstrip('\n')
+            if not line:
+                if 'data' in fields:
+                    return fields
+                continue
+            name, _, value = line.partition(': ')
+            fields[name] = value
+
+    def test_sse_stream_and_resume(self):
+        async def scenario(client):
+            stream = await client.get('/evenements')
+            self.assertEqual(stream.headers['Content-Type'], 'text/event-stream')
+            init = await self.read_event(stream)
+            self.assertEqual(init['event'], 'INIT')
+            await self.solve("Alice", 0)
+            solved = await self.read_event(stream)
+            self.assertEqual(solved['event'], 'WORD_SOLVED')
+            self.assertEqual(int(solved['id']), main.broadcast_seq)
+            self.assertEqual(json.loads(solved['data'])['seq'], main.broadcast_seq)
+            stream.close()
+
+            await main.give_hint(2)
+            resumed = await client.get('/evenements', headers={'Last-Event-ID': solved['id']})
+            missed = await self.read_event(resumed)
+            self.assertEqual(missed['event'], 'CELL_REVEALED')
+            resumed.close()
+
+            main.event_log.clear()
+            stale = await client.get('/evenements', headers={'Last-Event-ID': solved['id']})
+            self.assertEqual((await self.read_event(stale))['event'], 'INIT')
+            stale.close()
+
+            # Reprise à travers un changement de grille, depuis le dernier évènement de l'ancienne
+            await main.give_hint(2)
+            last_before_reset = main.broadcast_seq
+            main.current_grid = {"grid_id": "g2", "words": [
+                {"id": 1, "answer": "JAVA", "clue": "Île", "x": 0, "y": 0, "direction": "horizontal", "solved": False}]}
+            main.prepare_grid_state()
+            main.rebuild_answer_index()
+            main.start_word_timers()
+            main.grid_changed()
+            await main.broadcast_grid()
+            await self.solve("Bob", 0)
+            across = await client.get('/evenements', headers={'Last-Event-ID': str(last_before_reset)})
+            init = await self.read_event(across)
+            self.assertEqual(init['event'], 'INIT')
+            self.assertEqual(json.loads(init['data'])['grid']['grid_id'], "g2")
+            self.assertEqual((await self.read_event(across))['event'], 'WORD_SOLVED')
+            across.close()
+            # Plus ancien que le tampon : la grille actuelle, déjà à jour
+            older = await client.get('/evenements', headers={'Last-Event-ID': str(last_before_reset - 1)})
+            init = await self.read_event(older)
+            self.assertEqual(int(init['id']), main.broadcast_seq)
+            self.assertTrue(json.loads(init['data'])['grid']['words'][0]['solved'])
+            older.close()
+        with patch('main.save_grid'):
+            self.run_client(scenario)
+
+    def test_slow_sse_client_is_dropped(self):
+        queue = asyncio.Queue(maxsize=1)
+        main.sse_clients.add(queue)
+        main.publish_event(b"a")
+        main.publish_event(b"b")
+        self.assertNotIn(queue, main.sse_clients)
+
+
 class TestGameLogic(unittest.TestCase):
     """Tests de logique de jeu"""
 
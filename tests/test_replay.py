@@ -0,0 +1,134 @@
+import unittest
+import os
+import json
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+import main
+import replay
+
+def make_grid(grid_id, answers):
+    words = [{"id": i + 1, "clue": f"Déf {i + 1}", "answer": answer, "x": 0, "y": 2 * i,
+              "direction": "horizontal", "solved": False} for i, answer in enumerate(answers)]
+    return {"grid_id": grid_id, "size": 8, "words": words}
+
+class TestChatRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, 'live.jsonl')
+        self.recorder = replay.ChatRecorder(self.filename)
+
+    def tearDown(self):
+        self.recorder.close()
+        self.tmp.cleanup()
+
+    def test_records_tracked_commands_and_guesses(self):
+        self.recorder.record_grid(make_grid("g1", ["PYTHON"]), channel="streamer")
+        self.recorder.record_message("alice", "!mf 1 python")
+        self.recorder.record_message("bob", "!indice 1")
+        self.recorder.record_message("bob", "!")
+        self.recorder.record_message("carol", "python", chat_guesses=True)
+        self.recorder.record_message("dave", "salut tout le monde")
+        self.recorder.close()
+
+        entries = replay.read_log(self.filename)
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(entries[0]["channel"], "streamer")
+        self.assertEqual(entries[0]["grid"]["grid_id"], "g1")
+        self.assertEqual((entries[1]["cmd"], entries[1]["user"], entries[1]["args"]), ("mf", "alice", ["1", "python"]))
+        self.assertEqual((entries[2]["cmd"], entries[2]["args"]), ("chat", ["python"]))
+        self.assertTrue(all("t" in e for e in entries))
+
+    def test_appends_compact_lines(self):
+        self.recorder.record_message("alice", "!score")
+        self.recorder.close()
+        other = replay.ChatRecorder(self.filename)
+        other.record_message("bob", "!score")
+        other.close()
+        with open(self.filename, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertNotIn(': ', lines[0])
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.entries = [
+            {"t": 0, "grid": make_grid("g1", ["PYTHON", "CODE"]), "channel": "streamer"},
+            {"t": 0.01, "cmd": "mf", "user": "alice", "args": ["1", "python"]},
+            {"t": 0.02, "cmd": "mf", "user": "bob", "args": ["2", "rust"]},
+            {"t": 0.02, "cmd": "mf", "user": "bob", "args": ["2"]},
+            {"t": 0.03, "cmd": "score", "user": "alice", "args": []},
+            {"t": 0.04, "cmd": "mf", "user": "bob", "args": ["2", "code"]},
+            {"t": 0.05, "cmd": "classement", "user": "carol", "args": ["grille"]},
+            {"t": 0.06, "cmd": "reset_grille", "user": "streamer", "args": []},
+            {"t": 0.06, "grid": make_grid("g2", ["JAVA"])},
+            {"t": 0.07, "cmd": "mf", "user": "carol", "args": ["1", "java"]},
+        ]
+        self.saved_dir = os.getcwd()
+        self.saved_grid = main.current_grid
+
+    def tearDown(self):
+        os.chdir(self.saved_dir)
+        main.current_grid = self.saved_grid
+
+    def test_replay_drives_commands(self):
+        report = asyncio.run(replay.replay(self.entries))
+        self.assertEqual(report["events"], 8)
+        self.assertEqual(report["speed"], "max")
+        self.assertEqual(report["latency_ms"]["all"]["n"], 8)
+        self.assertEqual(report["latency_ms"]["mf"]["n"], 5)
+        self.assertIn("p99", report["latency_ms"]["reset_grille"])
+        self.assertEqual(set(report["digest"]), {"grid", "scores", "leaderboard", "chat"})
+
+    def test_replay_restores_module_state(self):
+        clock, generator = main.clock, main.GridGenerator
+        asyncio.run(replay.replay(self.entries))
+        self.assertIs(main.clock, clock)
+        self.assertIs(main.GridGenerator, generator)
+        self.assertIs(main.current_grid, self.saved_grid)
+        self.assertEqual(os.getcwd(), self.saved_dir)
+
+    def test_state_is_identical_across_speeds(self):
+        fast = asyncio.run(replay.replay(self.entries))
+        paced = asyncio.run(replay.replay(self.entries, speed=100))
+        lines, diverged = replay.compare_reports(fast, paced)
+        self.assertEqual(diverged, [])
+        self.assertTrue(any(line.strip().startswith("mf") for line in lines))
+
+    def test_divergence_is_reported(self):
+        before = asyncio.run(replay.replay(self.entries))
+        self.entries[5] = {"t": 0.04, "cmd": "mf", "user": "dave", "args": ["2", "code"]}
+        after = asyncio.run(replay.replay(self.entries))
+        _, diverged = replay.compare_reports(before, after)
+        self.assertIn("scores", diverged)
+        self.assertIn("chat", diverged)
+        self.assertNotIn("grid", diverged)
+
+    def test_replays_chat_guesses(self):
+        self.entries[0]["chat_guesses"] = True
+        self.entries.insert(1, {"t": 0.005, "cmd": "chat", "user": "erin", "args": ["python"]})
+        self.entries.insert(2, {"t": 0.006, "cmd": "chat", "user": "erin", "args": ["bonjour"]})
+        report = asyncio.run(replay.replay(self.entries))
+        self.assertEqual(report["latency_ms"]["chat"]["n"], 2)
+        self.assertEqual(report["events"], 10)
+
+    def test_chat_lines_skipped_without_guess_mode(self):
+        entries = [
+            {"t": 0, "grid": make_grid("g1", ["PYTHON"]), "channel": "streamer", "chat_guesses": False},
+            {"t": 0.01, "cmd": "chat", "user": "erin", "args": ["python"]},
+            {"t": 0.02, "cmd": "mf", "user": "alice", "args": ["1", "python"]},
+        ]
+        report = asyncio.run(replay.replay(entries))
+        self.assertEqual(report["events"], 1)
+        self.assertNotIn("chat", report["latency_ms"])
+        self.assertEqual(report["latency_ms"]["mf"]["n"], 1)
+
+    def test_percentiles(self):
+        summary = replay.latency_summary([float(i) for i in range(1, 101)])
+        self.assertEqual((summary["p50"], summary["p95"], summary["p99"], summary["max"]), (51.0, 96.0, 100.0, 100.0))
+
+if __name__ == '__main__':
+    unittest.main()
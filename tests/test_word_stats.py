@@ -0,0 +1,87 @@
+import unittest
+import os
+import json
+import tempfile
+import sys
+from pathlib import Path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+from word_stats import WordStats, MAX_SAMPLES
+
+class TestWordStats(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, 'stats.json')
+        self.stats = WordStats(self.filename)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_unknown_word(self):
+        self.assertIsNone(self.stats.solve_rate("PYTHON"))
+        self.assertIsNone(self.stats.median_time("PYTHON"))
+
+    def test_solve_rate(self):
+        for _ in range(4):
+            self.stats.record_shown("python")
+        self.stats.record_solve("PYTHON", 12.0)
+        self.assertEqual(self.stats.solve_rate("Python"), 0.25)
+
+    def test_median_time(self):
+        for t in [30, 10, 20]:
+            self.stats.record_solve("PYTHON", t)
+        self.assertEqual(self.stats.median_time("PYTHON"), 20)
+        self.stats.record_solve("PYTHON", 40)
+        self.assertEqual(self.stats.median_time("PYTHON"), 25)
+
+    def test_difficulty(self):
+        self.assertIsNone(self.stats.difficulty("PYTHON"))
+        for answer in ["FACILE", "DIFFICILE"]:
+            for _ in range(5):
+                self.stats.record_shown(answer)
+        for _ in range(5):
+            self.stats.record_solve("FACILE", 5)
+        self.stats.record_solve("DIFFICILE", 600)
+        for _ in range(20):
+            self.stats.record_wrong("DIFFICILE")
+        easy, hard = self.stats.difficulty("FACILE"), self.stats.difficulty("DIFFICILE")
+        self.assertLess(easy, 0.1)
+        self.assertGreater(hard, 0.7)
+        self.assertLessEqual(hard, 1.0)
+
+    def test_samples_are_bounded(self):
+        for t in range(MAX_SAMPLES + 10):
+            self.stats.record_solve("PYTHON", t)
+        self.assertEqual(len(self.stats.words["PYTHON"]["times"]), MAX_SAMPLES)
+        self.assertEqual(self.stats.words["PYTHON"]["solved"], MAX_SAMPLES + 10)
+
+    def test_take_changes(self):
+        self.stats.record_shown("python")
+        self.stats.record_wrong("JAVA")
+        self.assertEqual(self.stats.take_changes(), {"PYTHON", "JAVA"})
+        self.assertEqual(self.stats.take_changes(), set())
+        generation = self.stats.generation
+        self.stats.load()
+        self.assertEqual(self.stats.generation, generation + 1)
+
+    def test_save_and_load(self):
+        self.stats.record_shown("PYTHON")
+        self.stats.record_wrong("PYTHON")
+        self.stats.save()
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["PYTHON"]["wrong"], 1)
+        reloaded = WordStats(self.filename).load()
+        self.assertEqual(reloaded.words, self.stats.words)
+
+    def test_save_skipped_when_clean(self):
+        self.stats.save()
+        self.assertFalse(os.path.exists(self.filename))
+
+    def test_load_corrupted(self):
+        with open(self.filename, 'w', encoding='utf-8') as f:
+            f.write('{"invalid": json}')
+        self.assertEqual(WordStats(self.filename).load().words, {})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,105 @@
+import json
+import os
+
+MAX_SAMPLES = 50
+REFERENCE_TIME = 120
+
+class WordStats:
+    """Statistiques de difficulté par mot, alimentées par le bot et lues par le générateur.
+
+    Tout est tenu en mémoire : les enregistrements sont en O(1) et le fichier
+    n'est réécrit que par `save()` (fin de grille, reset, arrêt).
+    """
+
+    def __init__(self, filename='stats_mots.json'):
+        self.filename = filename
+        self.words = {}
+        self.dirty = False
+        self.changed = set()
+        self.generation = 0
+
+    def load(self):
+        if os.path.exists(self.filename) and os.path.getsize(self.filename) > 0:
+            try:
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    self.words = json.load(f)
+            except Exception as e:
+                print(f"❌ Erreur lecture statistiques : {e}")
+                self.words = {}
+        self.dirty = False
+        self.changed = set()
+        self.generation += 1
+        return self
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            with open(self.filename, 'w', encoding='utf-8') as f:
+                json.dump(self.words, f, ensure_ascii=False, separators=(',', ':'))
+            self.dirty = False
+        except Exception as e:
+            print(f"❌ Erreur sauvegarde statistiques : {e}")
+
+    def state(self):
+        return {"words": self.words, "dirty": self.dirty}
+
+    def restore(self, state):
+        """Reprend les statistiques figées par `state()` sans relire le fichier"""
+        self.words = state["words"]
+        self.dirty = state["dirty"]
+        self.changed = set()
+        self.generation += 1
+
+    def entry(self, answer):
+        answer = answer.upper()
+        if answer not in self.words:
+            self.words[answer] = {"shown": 0, "solved": 0, "wrong": 0, "times": []}
+        self.dirty = True
+        self.changed.add(answer)
+        return self.words[answer]
+
+    def take_changes(self):
+        """Mots modifiés depuis le dernier appel, pour ne repondérer qu'eux dans le générateur"""
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def record_shown(self, answer):
+        self.entry(answer)["shown"] += 1
+
+    def record_solve(self, answer, elapsed):
+        stats = self.entry(answer)
+        stats["solved"] += 1
+        stats["times"].append(round(elapsed, 1))
+        if len(stats["times"]) > MAX_SAMPLES:
+            del stats["times"][0]
+
+    def record_wrong(self, answer):
+        self.entry(answer)["wrong"] += 1
+
+    def solve_rate(self, answer):
+        stats = self.words.get(answer.upper())
+        if not stats or not stats["shown"]:
+            return None
+        return min(stats["solved"] / stats["shown"], 1.0)
+
+    def median_time(self, answer):
+        stats = self.words.get(answer.upper())
+        if not stats or not stats["times"]:
+            return None
+        times = sorted(stats["times"])
+        middle = len(times) // 2
+        if len(times) % 2:
+            return times[middle]
+        return (times[middle - 1] + times[middle]) / 2
+
+    def difficulty(self, answer):
+        """Difficulté estimée entre 0 (facile) et 1 (difficile), None si le mot n'a jamais été joué"""
+        stats = self.words.get(answer.upper())
+        if not stats or not stats["shown"]:
+            return None
+        rate = self.solve_rate(answer)
+        median = self.median_time(answer)
+        slowness = median / (median + REFERENCE_TIME) if median is not None else 1.0
+        wrong = stats["wrong"] / stats["shown"]
+        return 0.5 * (1 - rate) + 0.3 * slowness + 0.2 * wrong / (wrong + 3)